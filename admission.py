@@ -0,0 +1,163 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# How often a queued caller wakes up to re-check (and re-report its position)
+POLL_SECONDS = 0.5
+
+
+def retry_after_seconds(ex):
+    """Seconds from a Retry-After header on an API error, if the provider sent one."""
+    response = getattr(ex, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(ex) -> bool:
+    return getattr(ex, "status_code", None) == 429
+
+
+def is_transient(ex) -> bool:
+    """Server errors and dropped connections: worth retrying, but not a reason to slow everyone down."""
+    status = getattr(ex, "status_code", None)
+    return (status is not None and status >= 500) or type(ex).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class AdmissionController:
+    """
+    Process-wide gate for persona requests, shared by every Streamlit session:
+    - token bucket: at most `rate_per_s` starts per second on average, bursts up to `burst`
+    - at most `max_in_flight` requests running at once
+    - strict FIFO queue, with each waiter told its position
+    - on a 429 all admissions pause (Retry-After or exponential backoff) and the request is retried,
+      so throughput settles at the provider limit instead of everyone failing together
+    Build the OpenAI client with max_retries=0 so retries happen here, in line with everyone else.
+    """
+
+    def __init__(self, rate_per_s: float = 1.0, burst: int = 5, max_in_flight: int = 8,
+                 max_retries: int = 4, base_backoff: float = 1.0):
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.rate_limited = 0
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._queue = deque()
+        self._cond = threading.Condition()
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def run(self, fn, on_position=None):
+        """
+        Call `fn()` once admitted, retrying on 429s and transient errors. `on_position(n)` is
+        called from the caller's thread with its 1-based queue position whenever that changes.
+        """
+        for attempt in range(self.max_retries + 1):
+            delay = 0.0
+            with self.slot(on_position):
+                try:
+                    return fn()
+                except Exception as ex:
+                    if attempt == self.max_retries or not (is_rate_limited(ex) or is_transient(ex)):
+                        raise
+                    delay = retry_after_seconds(ex) or self.base_backoff * 2 ** attempt
+                    delay += random.uniform(0, delay / 4)  # jitter so retries don't line up
+                    if is_rate_limited(ex):
+                        print(f"[Admission] 429 from provider, pausing admissions for {delay:.1f}s")
+                        self.backoff(delay)
+                        delay = 0.0
+                    else:
+                        print(f"[Admission] Transient error, retrying in {delay:.1f}s: {ex}")
+            time.sleep(delay)
+
+    @contextmanager
+    def slot(self, on_position=None):
+        self.acquire(on_position)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self, on_position=None) -> None:
+        ticket = object()
+        last_position = None
+        with self._cond:
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_admit(ticket)
+                    if wait is None:
+                        return
+                    position = self._queue.index(ticket) + 1
+                    if position == last_position:
+                        self._cond.wait(timeout=min(wait, POLL_SECONDS))
+                        continue
+                # Report outside the lock; the callback may be slow (it updates the page)
+                last_position = position
+                if on_position is not None:
+                    on_position(position)
+        except BaseException:
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                self._cond.notify_all()
+            raise
+
+    def try_acquire(self) -> bool:
+        """Take a token and a slot now if one is free and nobody is queued; never waits."""
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+            if self._try_admit(ticket) is None:
+                return True
+            self._queue.remove(ticket)
+            return False
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def backoff(self, seconds: float) -> None:
+        """Stop admitting anyone for `seconds` and drain the bucket."""
+        with self._cond:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"queued": len(self._queue), "in_flight": self._in_flight, "rate_limited": self.rate_limited}
+
+    # -----------------------------
+    # Internals (call with the lock held)
+    # -----------------------------
+    def _try_admit(self, ticket):
+        """Admit `ticket` and return None, or return how long to wait before trying again."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_s)
+        self._refilled_at = now
+        if self._queue[0] is not ticket:
+            return POLL_SECONDS
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= self.max_in_flight:
+            return POLL_SECONDS
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate_per_s
+        self._queue.popleft()
+        self._tokens -= 1
+        self._in_flight += 1
+        self._cond.notify_all()
+        return None
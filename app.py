@@ -1,27 +1,29 @@
-import os
-import json
-import textwrap
-from datetime import datetime
+import time
 
 import streamlit as st
-from dotenv import load_dotenv
-from openai import OpenAI
-from PIL import Image, ImageDraw, ImageFont
 
-# -----------------------------
-# Load env
-# -----------------------------
-load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    raise ValueError("OPENAI_API_KEY not found. Put it in a .env file.")
-
-client = OpenAI(api_key=api_key)
+from app_support import (
+    CARD_FIELDS, get_admission, get_client, get_gallery, get_hedge_policy, get_hedge_pool, get_persona_cache,
+    get_prefetch_pool, get_telemetry, show_card_field, stream_persona_text
+)
+from persona import (
+    DEFAULT_TONE, PERSONA_MODEL, PERSONA_TEXT_FORMAT, TONES, PersonaFormatError, build_persona_prompt,
+    finish_persona, format_stats, is_valid_card_text
+)
+from card_gallery import card_hash
+from hedging import hedged_persona_text
+from persona_cache import make_key
+from telemetry import RequestTimer
+from speculation import start_speculation
 
 # -----------------------------
 # Streamlit UI
+# Streamlit re-runs this script on every widget change; the client, cache and
+# helpers live in app_support so each rerun only rebuilds the page.
 # -----------------------------
 st.set_page_config(page_title="Inner Child Cartoon", page_icon="🧒", layout="centered")
+client = get_client()
+
 st.title("🧒 Inner Child Cartoon")
 st.caption("A wholesome AI app: name + childhood favorite → cartoon persona + happy predictions + a shareable card.")
 
@@ -33,187 +35,194 @@ favorite = st.text_input(
 
 tone = st.selectbox(
     "Style",
-    ["Sweet & Wholesome", "Funny & Playful", "Super Heroic", "Poetic & Warm"],
-    index=1
+    TONES,
+    index=TONES.index(DEFAULT_TONE)
 )
 
 kid_safe = st.toggle("Extra kid-safe mode", value=True)
+hedging = get_hedge_policy() is not None
+stream = st.toggle("Stream results as they arrive", value=True, disabled=hedging,
+                   help="Off while hedged requests are on: fields appear once a card has won.") and not hedging
+fresh = st.checkbox("Fresh result (skip the persona cache)", value=False)
+prefetch = st.toggle("Speculative prefetch (start while you pick a style)", value=False)
+
+with st.expander("Card download options"):
+    # Labels -> card_image.CARD_FORMATS keys (kept here so PIL isn't imported just to draw the page)
+    download_formats = {"PNG": "png", "WebP (small)": "webp", "JPEG": "jpeg"}
+    card_format = download_formats[st.selectbox("Format", list(download_formats))]
+    card_quality = st.slider("Quality (WebP / JPEG)", 40, 95, 85, disabled=card_format not in ("webp", "jpeg"))
 
 # -----------------------------
-# Helpers
+# Find my card (served straight from the gallery, no LLM or PIL)
 # -----------------------------
-def safe_json_parse(text: str):
-    """Best-effort JSON parser."""
-    text = text.strip()
-    # If the model adds extra text, try to extract JSON block
-    start = text.find("{")
-    end = text.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        text = text[start:end+1]
-    return json.loads(text)
-
-def make_card_image(card: dict, out_path: str) -> None:
-    """
-    Generate a simple 'cartoon card' image locally using PIL.
-    No external images needed (demo-safe).
-    """
-    W, H = 1024, 1024
-    img = Image.new("RGB", (W, H), (250, 250, 255))
-    d = ImageDraw.Draw(img)
-
-    # Fonts (fallback to default if fonts not found)
-    def load_font(size: int):
-        for f in ["arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf"]:
-            try:
-                return ImageFont.truetype(f, size)
-            except Exception:
-                continue
-        return ImageFont.load_default()
-
-    font_title = load_font(64)
-    font_sub = load_font(36)
-    font_body = load_font(30)
-    font_small = load_font(26)
-
-    # Background shapes
-    d.rounded_rectangle([40, 40, W-40, H-40], radius=40, fill=(255, 255, 255))
-    d.rounded_rectangle([70, 90, W-70, 240], radius=30, fill=(230, 245, 255))
-    d.ellipse([90, 280, 420, 610], fill=(255, 245, 220), outline=(200, 200, 200), width=4)  # "face" placeholder
-    d.rounded_rectangle([460, 280, W-90, 610], radius=25, fill=(245, 235, 255), outline=(220, 210, 240), width=3)
-
-    # Cute doodles
-    d.ellipse([150, 360, 200, 410], fill=(0, 0, 0))
-    d.ellipse([300, 360, 350, 410], fill=(0, 0, 0))
-    d.arc([200, 420, 320, 520], start=10, end=170, fill=(0, 0, 0), width=6)  # smile
-    d.text((130, 620), "🙂", font=font_title, fill=(0, 0, 0))
-    d.text((210, 630), "Inner Child Mode: ON", font=font_sub, fill=(40, 40, 60))
-
-    # Title
-    d.text((90, 115), f"{card.get('card_title','Inner Child Cartoon')}", font=font_title, fill=(20, 40, 80))
-
-    # Right block info
-    x0, y0 = 490, 300
-    d.text((x0, y0), f"Name: {card.get('name','')}", font=font_sub, fill=(60, 30, 90))
-    d.text((x0, y0+55), f"Favorite: {card.get('favorite','')}", font=font_body, fill=(60, 30, 90))
-
-    persona = card.get("persona_name", "The Joy Keeper")
-    tagline = card.get("tagline", "Smiles in small moments.")
-    superpower = card.get("superpower", "Warmth Boost")
-    comfort = card.get("comfort_snack", "Hot chocolate")
-    catchphrase = card.get("catchphrase", "We got this!")
-
-    # Wrap helper
-    def draw_wrapped(label, text, y, max_width_chars=34):
-        d.text((x0, y), label, font=font_small, fill=(90, 70, 120))
-        wrapped = "\n".join(textwrap.wrap(text, width=max_width_chars))
-        d.text((x0, y+32), wrapped, font=font_body, fill=(40, 20, 70))
-        return y + 32 + (len(wrapped.splitlines()) * 34) + 18
-
-    y = 380
-    y = draw_wrapped("Persona:", persona, y)
-    y = draw_wrapped("Tagline:", tagline, y)
-    y = draw_wrapped("Superpower:", superpower, y)
-    y = draw_wrapped("Comfort snack:", comfort, y)
-    y = draw_wrapped("Catchphrase:", catchphrase, y)
-
-    # Predictions at bottom
-    preds = card.get("predictions", [])
-    d.rounded_rectangle([70, 700, W-70, 930], radius=30, fill=(235, 255, 240), outline=(190, 230, 200), width=3)
-    d.text((95, 720), "🔮 Happy Predictions", font=font_sub, fill=(10, 80, 40))
-
-    py = 780
-    for i, p in enumerate(preds[:3], start=1):
-        line = f"{i}. {p}"
-        wrapped = "\n".join(textwrap.wrap(line, width=60))
-        d.text((95, py), wrapped, font=font_body, fill=(10, 60, 30))
-        py += 42 + (len(wrapped.splitlines()) * 32)
-
-    # Footer
-    footer = f"Generated on {datetime.now().strftime('%d %b %Y')}  •  Just for fun ✨"
-    d.text((90, 955), footer, font=font_small, fill=(120, 120, 140))
-
-    img.save(out_path)
+with st.expander("🔎 Find my card"):
+    lookup_name = st.text_input("Name on the card", key="lookup_name")
+    any_date = st.checkbox("Any date", value=True)
+    lookup_date = None if any_date else st.date_input("Event date").isoformat()
+    if lookup_name:
+        gallery = get_gallery()
+        matches = gallery.find(lookup_name, lookup_date)
+        if not matches:
+            st.info("No card found for that name yet.")
+        for m in matches:
+            st.markdown(f"**{m['persona_name']}** — {m['event_date']}")
+            thumb = gallery.get_image(m["hash"], "thumb", m["event_date"])
+            if thumb:
+                st.image(thumb, use_container_width=True)
+            for fmt in gallery.image_formats(m["hash"], m["event_date"]):
+                if fmt == "thumb":
+                    continue
+                ext = "jpg" if fmt.startswith("jpeg") else fmt.split("-")[0]
+                st.download_button(
+                    f"⬇️ Download ({fmt})",
+                    data=gallery.get_image(m["hash"], fmt, m["event_date"]),
+                    file_name=f"{m['name']}_inner_child_card.{ext}",
+                    mime=f"image/{'jpeg' if ext == 'jpg' else ext}",
+                    key=f"gallery_{m['hash']}_{m['event_date']}_{fmt}",
+                    use_container_width=True
+                )
+
+persona_cache = get_persona_cache()
+persona_key = make_key(name, favorite, tone, kid_safe)
+
+# -----------------------------
+# Speculative prefetch
+# Start the request for the current inputs before the click; cancel it when they change.
+# -----------------------------
+speculation = st.session_state.get("speculation")
+wanted = prefetch and name and favorite and (fresh or not persona_cache.contains(persona_key))
+if speculation is not None and not (wanted and speculation.key == persona_key):
+    speculation.cancel()
+    speculation = st.session_state["speculation"] = None
+if wanted and speculation is None:
+    st.session_state["speculation"] = start_speculation(
+        get_prefetch_pool(), client, persona_key, build_persona_prompt(name, favorite, tone, kid_safe),
+        admission=get_admission()
+    )
 
 # -----------------------------
 # Generate
 # -----------------------------
 if st.button("✨ Reveal My Inner Child", use_container_width=True, disabled=not (name and favorite)):
-    style = tone
-    safety = "Very kid-safe, wholesome, no insults, no sensitive topics." if kid_safe else "Playful and funny, still respectful."
-
-    prompt = f"""
-You are a warm, funny, family-friendly storyteller.
-Create an "Inner Child Cartoon" persona for a participant.
-
-Participant:
-- Name: {name}
-- Childhood favorite: {favorite}
-- Style: {style}
-Safety: {safety}
-
-Rules:
-- This is purely playful, not real psychological analysis.
-- Keep it uplifting.
-- Make it feel like a cute cartoon character profile.
-
-Return ONLY valid JSON with these keys:
-{{
-  "card_title": "Inner Child Cartoon Card",
-  "name": "{name}",
-  "favorite": "{favorite}",
-  "persona_name": "",
-  "tagline": "",
-  "superpower": "",
-  "comfort_snack": "",
-  "catchphrase": "",
-  "why_it_matches": "",
-  "predictions": ["", "", ""]
-}}
-
-Predictions should be short, joyful, and relatable (not spooky).
-"""
-
-    with st.spinner("🧒 Talking to your inner child..."):
-        res = client.responses.create(
-            model="gpt-5",
-            input=prompt
-        )
-
-    try:
-        card = safe_json_parse(res.output_text)
-    except Exception:
-        st.error("AI returned an unexpected format. Click again once.")
-        st.code(res.output_text)
-        st.stop()
-
-    # Show results (text)
-    st.success("🎉 Inner Child Revealed!")
-    st.subheader(f"🎭 Persona: {card.get('persona_name','')}")
-    st.write(card.get("why_it_matches", ""))
+    timer = RequestTimer(model=PERSONA_MODEL, stream=stream, format=card_format, cache_hit=True)
+    with timer.stage("prompt"):
+        prompt = build_persona_prompt(name, favorite, tone, kid_safe)
+
+    # Placeholders so streamed fields can appear in page order
+    status_slot = st.empty()
+    slots = {field: st.empty() for field in CARD_FIELDS}
+
+    def show_queue_position(position):
+        status_slot.info(f"⏳ Lots of requests right now. You are #{position} in line...")
+
+    queue_started = []  # when this click started waiting for admission (again, after a retry)
+
+    def request_persona_text():
+        timer.stages["queue"] = timer.stages.get("queue", 0.0) + (time.perf_counter() - queue_started.pop()) * 1000
+        status_slot.empty()
+        try:
+            with timer.stage("llm"):
+                if hedging:
+                    # Primary and a late backup request race in the background; fields appear once one wins
+                    output_text, timer.tags["tier"] = hedged_persona_text(
+                        get_hedge_pool(), client, prompt, PERSONA_MODEL, get_hedge_policy(), is_valid_card_text,
+                        admission=get_admission(), on_usage=timer.record_usage,
+                    )
+                    return output_text
+                if stream:
+                    return stream_persona_text(client, prompt, slots, timer)
+                res = client.responses.create(
+                    model=PERSONA_MODEL,
+                    input=prompt,
+                    text=PERSONA_TEXT_FORMAT
+                )
+                timer.record_usage(res.usage)
+                return res.output_text
+        finally:
+            queue_started.append(time.perf_counter())
+
+    def generate_card():
+        timer.tags["cache_hit"] = False
+        with st.spinner("🧒 Talking to your inner child..."):
+            output_text = None
+            speculation = st.session_state.pop("speculation", None)
+            if speculation is not None and speculation.key == persona_key:
+                head_start = time.perf_counter() - speculation.started_at
+                with timer.stage("speculation_wait"):
+                    output_text = speculation.result()
+                for usage in speculation.usage:
+                    timer.record_usage(usage)
+                if output_text is not None:
+                    st.caption(f"⚡ Prefetch started {head_start:.1f}s before you clicked")
+            if output_text is None:
+                queue_started.append(time.perf_counter())
+                output_text = get_admission().run(request_persona_text, on_position=show_queue_position)
 
-    st.markdown(f"**✨ Tagline:** _{card.get('tagline','')}_")
-    st.markdown(f"**🦸 Superpower:** {card.get('superpower','')}")
-    st.markdown(f"**🍪 Comfort snack:** {card.get('comfort_snack','')}")
-    st.markdown(f"**🗣️ Catchphrase:** “{card.get('catchphrase','')}”")
+            try:
+                with timer.stage("parse"):
+                    return finish_persona(client, output_text, prompt, run=get_admission().run,
+                                          on_usage=timer.record_usage)
+            except PersonaFormatError as ex:
+                st.error("AI returned an unexpected format. Click again once.")
+                st.code(ex.output_text)
+                st.stop()
 
-    st.markdown("### 🔮 Happy Predictions")
-    for i, p in enumerate(card.get("predictions", [])[:3], start=1):
-        st.write(f"{i}. {p}")
+    card = persona_cache.get_or_create(persona_key, generate_card, refresh=fresh)
 
-    # Generate local image card (no OpenAI image model needed)
-    out_path = "inner_child_card.png"
-    make_card_image(card, out_path)
+    # Show results (text)
+    status_slot.success("🎉 Inner Child Revealed!")
+    for field in CARD_FIELDS:
+        show_card_field(slots[field], field, card.get(field, [] if field == "predictions" else ""))
+
+    # Generate local image card (no OpenAI image model needed), kept in memory for this session only
+    # The page shows a small thumbnail; the full-size card is only sent when downloaded.
+    # Cards already in the gallery (same content hash) are served from it without rendering.
+    from card_image import CARD_FORMATS, LOSSY_FORMATS, encode_image, make_thumbnail, render_card  # PIL loads here
+    _, _, card_mime, card_ext = CARD_FORMATS[card_format]
+    image_key = f"{card_format}-q{card_quality}" if card_format in LOSSY_FORMATS else card_format
+    gallery = get_gallery()
+    with timer.stage("gallery_lookup"):
+        h = card_hash(card)
+        card_bytes, thumb_bytes = gallery.get_image(h, image_key), gallery.get_image(h, "thumb")
+    timer.tags["gallery_hit"] = card_bytes is not None and thumb_bytes is not None
+    if not timer.tags["gallery_hit"]:
+        with timer.stage("render"):
+            img = render_card(card)
+        with timer.stage("encode"):
+            card_bytes, thumb_bytes = encode_image(img, card_format, card_quality), make_thumbnail(img)
+        with timer.stage("gallery_save"):
+            gallery.save(card, {image_key: card_bytes, "thumb": thumb_bytes})
 
     st.divider()
-    st.image(out_path, caption="🖼️ Your Inner Child Cartoon Card", use_container_width=True)
+    st.image(thumb_bytes, caption="🖼️ Your Inner Child Cartoon Card", use_container_width=True)
 
-    with open(out_path, "rb") as f:
-        st.download_button(
-            "⬇️ Download My Card",
-            data=f.read(),
-            file_name=f"{name}_inner_child_card.png",
-            mime="image/png",
-            use_container_width=True
-        )
+    st.download_button(
+        "⬇️ Download My Card",
+        data=card_bytes,
+        file_name=f"{name}_inner_child_card.{card_ext}",
+        mime=card_mime,
+        use_container_width=True
+    )
+    get_telemetry().emit(timer)
 
     st.caption("Just for fun ✨ Built with Python + OpenAI text + local card renderer (PIL).")
+    stats = persona_cache.stats()
+    st.caption(f"Persona cache: {stats['hits']} hits • {stats['misses']} misses • {stats['size']} stored")
+    fmt = format_stats.snapshot()
+    st.caption(f"Output format: {fmt['parse_failures']} parse failures • {fmt['invalid_cards']} incomplete cards • "
+               f"{fmt['repair_calls']} repair calls • {fmt['recovered']} recovered • {fmt['gave_up']} gave up")
+
+# -----------------------------
+# Operator view (open the app with ?ops=1)
+# -----------------------------
+if st.query_params.get("ops") == "1":
+    with st.expander("📈 Operator view: per-stage latency (ms, rolling)", expanded=True):
+        rows = get_telemetry().percentiles()
+        if rows:
+            st.table(rows)
+        else:
+            st.caption("No requests recorded yet.")
+        st.caption(f"Admission: {get_admission().stats()} • Cache: {get_persona_cache().stats()}")
+        st.caption(f"Output format: {format_stats.snapshot()}")
+        if get_hedge_policy() is not None:
+            st.caption(f"Hedging ({get_hedge_policy().hedge_model}): {get_hedge_policy().stats()}")
@@ -0,0 +1,143 @@
+"""
+Streamlit resources and view helpers for app.py.
+
+Streamlit re-executes app.py from the top on every interaction, so anything
+expensive lives here: this module is imported once per process and the
+client/cache are built once through st.cache_resource.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from dotenv import load_dotenv
+
+from admission import AdmissionController
+from card_gallery import CardGallery
+from hedging import HedgePolicy
+from json_stream import JsonFieldStream
+from persona import PERSONA_MODEL, PERSONA_TEXT_FORMAT
+from persona_cache import PersonaCache
+from telemetry import Telemetry
+
+# -----------------------------
+# Process-wide resources
+# -----------------------------
+@st.cache_resource
+def load_env() -> None:
+    load_dotenv()
+
+@st.cache_resource
+def get_client():
+    """One OpenAI client per process (building it costs ~40 ms, too much for every rerun)."""
+    from openai import OpenAI
+
+    load_env()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found. Put it in a .env file.")
+    # Retries go through the shared AdmissionController so 429 backoff applies to everyone
+    return OpenAI(api_key=api_key, max_retries=0)
+
+@st.cache_resource
+def get_admission():
+    """Process-wide rate limiter and FIFO queue in front of every persona request."""
+    load_env()
+    return AdmissionController(
+        rate_per_s=float(os.getenv("PERSONA_RATE_PER_MIN", "60")) / 60,
+        burst=int(os.getenv("PERSONA_BURST", "5")),
+        max_in_flight=int(os.getenv("PERSONA_MAX_IN_FLIGHT", "8")),
+    )
+
+@st.cache_resource
+def get_persona_cache():
+    """One persona cache per process, shared by every session."""
+    load_env()
+    return PersonaCache(
+        max_size=int(os.getenv("PERSONA_CACHE_SIZE", "256")),
+        ttl_seconds=float(os.getenv("PERSONA_CACHE_TTL", "86400")),
+        path=os.getenv("PERSONA_CACHE_FILE") or None,
+    )
+
+@st.cache_resource
+def get_prefetch_pool():
+    """Worker threads for speculative persona requests, shared by every session."""
+    load_env()
+    return ThreadPoolExecutor(max_workers=int(os.getenv("PERSONA_PREFETCH_WORKERS", "8")),
+                              thread_name_prefix="persona-prefetch")
+
+@st.cache_resource
+def get_hedge_policy():
+    """Hedged requests are on when PERSONA_HEDGE_MODEL names a faster backup model."""
+    load_env()
+    hedge_model = os.getenv("PERSONA_HEDGE_MODEL", "").strip()
+    if not hedge_model:
+        return None
+    return HedgePolicy(
+        hedge_model,
+        deadline_s=float(os.getenv("PERSONA_HEDGE_DEADLINE", "12")),
+        percentile=float(os.getenv("PERSONA_HEDGE_PERCENTILE", "90")),
+    )
+
+@st.cache_resource
+def get_hedge_pool():
+    """Worker threads that run the primary and hedge requests side by side."""
+    return ThreadPoolExecutor(max_workers=32, thread_name_prefix="persona-hedge")
+
+@st.cache_resource
+def get_gallery():
+    """SQLite store of every generated card, shared by every session."""
+    load_env()
+    return CardGallery(os.getenv("CARD_GALLERY_DB", "card_gallery.sqlite3"))
+
+@st.cache_resource
+def get_telemetry():
+    """Per-stage timings for every persona request: JSON lines on disk + rolling percentiles."""
+    load_env()
+    return Telemetry(os.getenv("PERSONA_TELEMETRY_FILE", "persona_telemetry.jsonl") or None)
+
+# -----------------------------
+# Card view helpers
+# -----------------------------
+# Card fields shown as text, in page order
+CARD_FIELDS = ["persona_name", "why_it_matches", "tagline", "superpower", "comfort_snack", "catchphrase", "predictions"]
+
+def show_card_field(slot, key, value) -> None:
+    """Render one card field into its placeholder."""
+    if key == "persona_name":
+        slot.subheader(f"🎭 Persona: {value}")
+    elif key == "why_it_matches":
+        slot.write(value)
+    elif key == "tagline":
+        slot.markdown(f"**✨ Tagline:** _{value}_")
+    elif key == "superpower":
+        slot.markdown(f"**🦸 Superpower:** {value}")
+    elif key == "comfort_snack":
+        slot.markdown(f"**🍪 Comfort snack:** {value}")
+    elif key == "catchphrase":
+        slot.markdown(f"**🗣️ Catchphrase:** “{value}”")
+    elif key == "predictions":
+        with slot.container():
+            st.markdown("### 🔮 Happy Predictions")
+            for i, p in enumerate(value[:3], start=1):
+                st.write(f"{i}. {p}")
+
+def stream_persona_text(client, prompt: str, slots: dict, timer=None) -> str:
+    """Stream the persona response, filling each field's slot as soon as it is complete."""
+    fields = JsonFieldStream()
+    chunks = []
+    events = client.responses.create(
+        model=PERSONA_MODEL,
+        input=prompt,
+        text=PERSONA_TEXT_FORMAT,
+        stream=True
+    )
+    for event in events:
+        if event.type == "response.completed" and timer is not None:
+            timer.record_usage(getattr(event.response, "usage", None))
+        if event.type != "response.output_text.delta":
+            continue
+        chunks.append(event.delta)
+        for key, value in fields.feed(event.delta):
+            if key in slots:
+                show_card_field(slots[key], key, value)
+    return "".join(chunks)
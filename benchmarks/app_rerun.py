@@ -0,0 +1,43 @@
+"""
+Measure Streamlit rerun wall-time for app.py, i.e. what every keystroke in the
+name field costs before the page updates. Uses Streamlit's AppTest runner, so no
+browser or server is needed and no API call is made (the button is never clicked).
+
+Run from the repo root:  python -m benchmarks.app_rerun [runs] [script]
+"""
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    script = os.path.abspath(sys.argv[2] if len(sys.argv) > 2 else "app.py")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+    at = AppTest.from_file(script, default_timeout=30)
+    t0 = time.perf_counter()
+    at.run()
+    first_ms = (time.perf_counter() - t0) * 1000
+
+    times = []
+    name = ""
+    for i in range(runs):
+        name += "abcdefghij"[i % 10]
+        at.text_input[0].input(name)
+        t0 = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - t0) * 1000)
+    if at.exception:
+        raise SystemExit(f"app raised: {at.exception}")
+
+    times.sort()
+    print(f"{os.path.basename(script)}: first run {first_ms:.1f} ms; keystroke reruns ({runs}) "
+          f"median {statistics.median(times):.2f} ms, p95 {times[int(len(times) * 0.95) - 1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Render/encode benchmark across a corpus of sample cards, per output format.
+
+Reports median render time, median encode time and mean encoded size for each
+format in card_image.CARD_FORMATS (lossy formats at a few qualities) and for the
+on-screen thumbnail.
+
+Run from the repo root:  python -m benchmarks.card_formats [cards]
+"""
+import random
+import statistics
+import sys
+import time
+
+import card_image
+from mock_openai import CARD_KEYS, fake_card
+
+NAMES = ["Hema", "Ravi", "Anu", "Karthik", "Meena", "Arjun", "Divya", "Sam"]
+FAVORITES = ["dosa", "cricket", "teddy bear", "Tom & Jerry", "hide-and-seek", "kites", "lego", "mango ice cream"]
+LOSSY_QUALITIES = [60, 75, 85]
+
+
+def sample_cards(n: int) -> list:
+    """Cards of varying text length, built the same way the mock API builds them."""
+    rng = random.Random(7)
+    cards = []
+    for i in range(n):
+        name, favorite = rng.choice(NAMES), rng.choice(FAVORITES)
+        card = fake_card(f"- Name: {name}\n- Childhood favorite: {favorite}", CARD_KEYS)
+        card["tagline"] += " Always" + " and always" * rng.randrange(4)
+        cards.append(card)
+    return cards
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    cards = sample_cards(n)
+    card_image.make_card_image(cards[0])  # warm caches
+
+    images, render_ms = [], []
+    for card in cards:
+        t0 = time.perf_counter()
+        images.append(card_image.render_card(card))
+        render_ms.append((time.perf_counter() - t0) * 1000)
+    print(f"{n} sample cards, render median {statistics.median(render_ms):.1f} ms")
+    print(f"  {'format':<22}{'encode ms':>10}{'size KB':>10}")
+
+    variants = [(fmt, None) for fmt in card_image.CARD_FORMATS if fmt not in card_image.LOSSY_FORMATS]
+    variants += [(fmt, q) for fmt in sorted(card_image.LOSSY_FORMATS) for q in LOSSY_QUALITIES]
+    for fmt, quality in variants:
+        encode_ms, sizes = [], []
+        for img in images:
+            t0 = time.perf_counter()
+            data = card_image.encode_image(img, fmt, quality or 85)
+            encode_ms.append((time.perf_counter() - t0) * 1000)
+            sizes.append(len(data))
+        label = fmt if quality is None else f"{fmt} q{quality}"
+        print(f"  {label:<22}{statistics.median(encode_ms):>10.1f}{statistics.fmean(sizes) / 1024:>10.1f}")
+
+    encode_ms, sizes = [], []
+    for img in images:
+        t0 = time.perf_counter()
+        data = card_image.make_thumbnail(img)
+        encode_ms.append((time.perf_counter() - t0) * 1000)
+        sizes.append(len(data))
+    label = f"thumbnail webp {card_image.THUMBNAIL_SIZE}px"
+    print(f"  {label:<22}{statistics.median(encode_ms):>10.1f}{statistics.fmean(sizes) / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark for make_card_image.
+
+"before" clears the font/template caches on every call, which is what the
+old renderer paid per card; "after" uses the warm caches.
+
+Run from the repo root:  python -m benchmarks.card_render [runs]
+"""
+import io
+import statistics
+import sys
+import time
+
+import card_image
+
+SAMPLE_CARD = {
+    "card_title": "Inner Child Cartoon Card",
+    "name": "Hema",
+    "favorite": "dosa",
+    "persona_name": "Captain Crispy",
+    "tagline": "Folds every problem into a tasty solution.",
+    "superpower": "Turns any rainy day into a picnic.",
+    "comfort_snack": "Ghee roast dosa",
+    "catchphrase": "Flip it and win it!",
+    "predictions": [
+        "A surprise snack will show up exactly when you need it.",
+        "Someone will laugh at your joke twice this week.",
+        "You will find something you thought you had lost.",
+    ],
+}
+
+
+def time_cards(runs: int, cold: bool):
+    """Return (render_ms, total_ms) lists; total includes the PNG encode."""
+    card_image.make_card_image(SAMPLE_CARD)  # warm-up (imports, codecs)
+    render_times, total_times = [], []
+    for _ in range(runs):
+        if cold:
+            card_image.load_font.cache_clear()
+            card_image.card_template.cache_clear()
+        t0 = time.perf_counter()
+        img = card_image.render_card(SAMPLE_CARD)
+        t1 = time.perf_counter()
+        img.save(io.BytesIO(), format="PNG")
+        t2 = time.perf_counter()
+        render_times.append((t1 - t0) * 1000)
+        total_times.append((t2 - t0) * 1000)
+    return render_times, total_times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    print(f"make_card_image, {runs} runs per mode (ms per card)")
+    for label, cold in [("before (no caches)", True), ("after (cached)", False)]:
+        render_times, total_times = time_cards(runs, cold)
+        print(f"  {label:<20} render median {statistics.median(render_times):7.2f}"
+              f"   render+encode median {statistics.median(total_times):7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Session count vs per-keystroke latency for classroom_server.py.
+
+Starts the server in a subprocess pinned to one CPU core (--no-ai, so no API calls), then for
+each session count opens that many event streams and has every "student" type a name and then
+letters at --keys-per-s, with ENTER every few keys (wrong guesses, so words, timers and game
+overs all happen). Latency is the time from sending a key POST to receiving the state snapshot
+that acknowledges it.
+
+Run from the repo root:
+    python -m benchmarks.classroom_load --sessions 10,30,100,300 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from benchmarks.load_test import percentile
+
+
+class Student:
+    def __init__(self, host: str, port: int, latencies: list):
+        self.host, self.port = host, port
+        self.latencies = latencies
+        self.session = None
+        self.sent = {}  # seq -> perf_counter at send
+        self.seq = 0
+        self.joined = asyncio.Event()
+
+    async def listen(self) -> None:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(f"GET /events HTTP/1.1\r\nhost: {self.host}\r\n\r\n".encode())
+        await reader.readuntil(b"\r\n\r\n")
+        event = None
+        try:
+            while True:
+                line = (await reader.readline()).decode().rstrip("\n")
+                if line.startswith("event: "):
+                    event = line[7:]
+                elif line.startswith("data: "):
+                    data = json.loads(line[6:])
+                    if event == "session":
+                        self.session = data["id"]
+                        self.joined.set()
+                    else:
+                        self.acknowledged(data["ack"])
+                    event = None
+        finally:
+            writer.close()
+
+    def acknowledged(self, ack: int) -> None:
+        now = time.perf_counter()
+        for seq in [s for s in self.sent if s <= ack]:
+            self.latencies.append((now - self.sent.pop(seq)) * 1000)
+
+    async def type(self, keys_per_s: float, until: float) -> None:
+        await self.joined.wait()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        keys = list("kid") + ["enter"]
+        try:
+            while time.perf_counter() < until:
+                key = keys.pop(0) if keys else ("enter" if self.seq % 6 == 5 else random.choice("abcdefghijklmnopqrstuvwxyz"))
+                self.seq += 1
+                self.sent[self.seq] = time.perf_counter()
+                body = key.encode()
+                writer.write(f"POST /key?session={self.session}&seq={self.seq} HTTP/1.1\r\nhost: {self.host}\r\n"
+                             f"content-length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+                await reader.readuntil(b"\r\n\r\n")  # 204, no body
+                await asyncio.sleep(random.expovariate(keys_per_s))
+        finally:
+            writer.close()
+
+
+async def run_level(host: str, port: int, sessions: int, keys_per_s: float, duration: float) -> list:
+    latencies = []
+    students = [Student(host, port, latencies) for _ in range(sessions)]
+    listeners = [asyncio.create_task(s.listen()) for s in students]
+    await asyncio.gather(*(s.joined.wait() for s in students))
+    await asyncio.sleep(0.5)
+    until = time.perf_counter() + duration
+    await asyncio.gather(*(s.type(keys_per_s, until) for s in students))
+    await asyncio.sleep(0.5)  # let the last snapshots arrive
+    for task in listeners:
+        task.cancel()
+    await asyncio.gather(*listeners, return_exceptions=True)
+    return latencies
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classroom server: sessions vs per-keystroke latency.")
+    parser.add_argument("--sessions", default="10,30,100,300")
+    parser.add_argument("--keys-per-s", type=float, default=2.0, help="typing rate per student")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of typing per level")
+    parser.add_argument("--port", type=int, default=8877)
+    parser.add_argument("--core", type=int, default=0, help="CPU core to pin the server to")
+    args = parser.parse_args()
+
+    host = "127.0.0.1"
+    server = subprocess.Popen(
+        [sys.executable, "classroom_server.py", "--no-ai", "--host", host, "--port", str(args.port)],
+        preexec_fn=lambda: os.sched_setaffinity(0, {args.core}), stdout=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(1.5)
+        print(f"classroom_server.py pinned to core {args.core}; {args.keys_per_s} keys/s per student, "
+              f"{args.duration:.0f}s per level (client runs on {os.cpu_count()} core(s))")
+        print(f"{'sessions':>8} {'keys/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'server CPU':>11}")
+        for n in (int(x) for x in args.sessions.split(",")):
+            cpu0, t0 = cpu_seconds(server.pid), time.perf_counter()
+            lat = sorted(asyncio.run(run_level(host, args.port, n, args.keys_per_s, args.duration)))
+            cpu = (cpu_seconds(server.pid) - cpu0) / (time.perf_counter() - t0)
+            print(f"{n:>8} {len(lat) / args.duration:>8.0f} {percentile(lat, 50):>8.2f} {percentile(lat, 95):>8.2f}"
+                  f" {percentile(lat, 99):>8.2f} {lat[-1] if lat else float('nan'):>8.2f} {cpu * 100:>10.0f}%")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Cold start of a game script: time from process launch to the first frame on screen, and an
+import-time profile of what that time is spent importing.
+
+Each run is a fresh interpreter (headless, a fake API key and an unreachable API URL so
+nothing is sent). The first run of each script also fills the font cache, so it is reported
+separately from the rest.
+
+Run from the repo root:
+    python -m benchmarks.cold_start intellispell.py intelliword.py --runs 10
+    python -m benchmarks.cold_start intelliword.py --imports     # top imports by cumulative time
+    git show HEAD~1:intelliword.py > /tmp/intelliword_old.py && python -m benchmarks.cold_start /tmp/intelliword_old.py
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Runs in the child: stop at the first display update and report when it happened.
+CHILD = """
+import os, runpy, sys, time
+import pygame
+
+def first_frame(*args, **kwargs):
+    print(time.time(), flush=True)
+    os._exit(0)
+
+pygame.display.flip = pygame.display.update = first_frame
+sys.argv = [sys.argv[1]]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+def child_env(tmp: str) -> dict:
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", OPENAI_API_KEY="sk-cold-start",
+               OPENAI_BASE_URL="http://127.0.0.1:9/v1", CLUE_CACHE_FILE=os.path.join(tmp, "clue_cache.json"),
+               FONT_CACHE_FILE=os.path.join(tmp, "font_cache.json"), SESSION_LOG_DIR=os.path.join(tmp, "logs"),
+               PYTHONDONTWRITEBYTECODE="")
+    env.setdefault("PYTHONPATH", os.getcwd())
+    return env
+
+
+def time_to_first_frame(script: str, env: dict) -> float:
+    t0 = time.time()
+    out = subprocess.run([sys.executable, "-c", CHILD, script], env=env, capture_output=True, text=True, timeout=60)
+    return (float(out.stdout.split()[-1]) - t0) * 1000
+
+
+def import_profile(script: str, env: dict, top: int) -> None:
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD, script], env=env,
+                         capture_output=True, text=True, timeout=60)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # a top-level import (nested ones are indented further)
+            rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    print(f"{script}: top-level imports by cumulative time ({sum(us for us, _ in rows) / 1000:.0f} ms total)")
+    for us, name in rows[:top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to first frame and import profile of game scripts.")
+    parser.add_argument("scripts", nargs="*", default=["intellispell.py", "Intellispell_v2.py", "intelliword.py"])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--imports", action="store_true", help="print an import-time profile instead")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for script in args.scripts:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = child_env(tmp)
+            if args.imports:
+                time_to_first_frame(script, env)  # warm the font cache and the OS file cache
+                import_profile(script, env, args.top)
+                continue
+            first = time_to_first_frame(script, env)
+            runs = sorted(time_to_first_frame(script, env) for _ in range(args.runs))
+            print(f"{script}: first launch {first:6.0f} ms; next {args.runs}: median {statistics.median(runs):6.0f} ms,"
+                  f" min {runs[0]:6.0f} ms, max {runs[-1]:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Per-frame CPU time of a game script on its PLAY and GAME_OVER screens, run headless.
+
+The script runs unmodified with scripted key presses (a name, then a letter typed or erased
+every few frames) and a clock that doesn't sleep. Main-thread CPU time is measured per frame,
+so the background clue threads don't count.
+
+--idle-seconds N instead leaves the NAME screen untouched for N seconds with the real clock
+and reports how often the main loop woke up and the process CPU time it used. (With the
+dummy video driver SDL can't block in event.wait and polls every 1 ms instead, so the CPU
+figure is only meaningful with a real display.)
+
+Run from the repo root:
+    python -m benchmarks.game_frames intelliword.py
+    git show HEAD~1:intelliword.py > /tmp/intelliword_old.py && python -m benchmarks.game_frames /tmp/intelliword_old.py
+"""
+import argparse
+import os
+import statistics
+import time
+from dataclasses import replace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from benchmarks.load_test import percentile  # noqa: E402
+from spell_engine import GAME_OVER  # noqa: E402
+
+
+class NoSleepClock:
+    def tick(self, framerate=0):
+        return 0
+
+
+def key(k, char=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=k, unicode=char, mod=0, scancode=0)
+
+
+def run(script: str, frames: int, warmup: int = 20, type_every: int = 10) -> dict:
+    game = {"__name__": "__main__", "__file__": script}
+    samples = {"PLAY": [], "GAME_OVER": []}
+    state = {"frame": 0, "cpu": None}
+    real_get = pygame.event.get
+
+    def scripted_events(*args, **kwargs):
+        real_get()
+        now = time.thread_time()
+        frame, state["frame"] = state["frame"], state["frame"] + 1
+        if state["cpu"] is not None and state.get("phase") in samples and state["measure"]:
+            samples[state["phase"]].append((now - state["cpu"]) * 1000)
+
+        events = []
+        play_end = 1 + warmup + frames
+        if frame == 0:
+            events = [key(ord(c), c) for c in "Ann"] + [key(pygame.K_RETURN, "\r")]
+        elif frame < play_end:
+            if frame % type_every == 0:  # a kid typing: add a letter, then erase it
+                events = [key(ord("e"), "e")] if frame % (2 * type_every) else [key(pygame.K_BACKSPACE)]
+        elif frame == play_end:
+            game["state"] = replace(game["state"], phase=GAME_OVER)  # jump straight to the final screen
+        elif frame >= play_end + warmup + frames:
+            events = [pygame.event.Event(pygame.QUIT)]
+
+        state["phase"] = game["state"].phase if "state" in game else None
+        state["measure"] = 1 + warmup <= frame < play_end or frame > play_end + warmup
+        state["cpu"] = time.thread_time()
+        return events
+
+    pygame.event.get = scripted_events
+    pygame.event.wait = lambda timeout=0: pygame.event.Event(pygame.NOEVENT)  # idle waits return at once
+    pygame.time.Clock = NoSleepClock
+    with open(script, encoding="utf-8") as f:
+        code = compile(f.read(), script, "exec")
+    exec(code, game)
+    return samples
+
+
+def idle(script: str, seconds: float) -> tuple:
+    """(main-loop wakeups per second, process CPU seconds) on an untouched NAME screen."""
+    game = {"__name__": "__main__", "__file__": script}
+    real_get = pygame.event.get
+    state = {"calls": 0, "t0": None}
+
+    def counting_events(*args, **kwargs):
+        events = real_get(*args, **kwargs)
+        state["calls"] += 1
+        if state["t0"] is None:
+            state["t0"], state["cpu0"] = time.perf_counter(), time.process_time()
+        elif time.perf_counter() - state["t0"] >= seconds:
+            state["wall"], state["cpu"] = time.perf_counter() - state["t0"], time.process_time() - state["cpu0"]
+            return [pygame.event.Event(pygame.QUIT)]
+        return events
+
+    pygame.event.get = counting_events
+    with open(script, encoding="utf-8") as f:
+        code = compile(f.read(), script, "exec")
+    exec(code, game)
+    return state["calls"] / state["wall"], state["cpu"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame CPU time of a game script, headless.")
+    parser.add_argument("script", nargs="?", default="intelliword.py")
+    parser.add_argument("--frames", type=int, default=600, help="measured frames per screen")
+    parser.add_argument("--idle-seconds", type=float, default=0, help="measure an idle NAME screen instead")
+    args = parser.parse_args()
+
+    if args.idle_seconds:
+        wakeups, cpu = idle(args.script, args.idle_seconds)
+        print(f"{args.script}: idle NAME screen for {args.idle_seconds:.0f}s: {wakeups:.1f} loop wakeups/s, "
+              f"{cpu / args.idle_seconds * 100:.1f}% CPU")
+        return
+
+    samples = run(args.script, args.frames)
+    print(f"{args.script}: main-thread CPU per frame (ms), {args.frames} frames per screen")
+    for phase, values in samples.items():
+        values = sorted(values)
+        print(f"  {phase:<10} mean {statistics.fmean(values):6.3f}   p50 {percentile(values, 50):6.3f}"
+              f"   p95 {percentile(values, 95):6.3f}   max {values[-1]:6.3f}")
+
+
+if __name__ == "__main__":
+    main()
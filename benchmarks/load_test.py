@@ -0,0 +1,100 @@
+"""
+Load driver for the app.py persona pipeline against the offline OpenAI mock.
+
+Each simulated session does what one click on "Reveal My Inner Child" does in a fresh
+Streamlit session: build the prompt, wait for admission, call the (mock) API, validate/repair
+the card and render the PNG. All sessions share one client and one AdmissionController,
+like the sessions of a single Streamlit process do.
+
+Run from the repo root:
+    python -m benchmarks.load_test --sessions 60 --latency lognormal:2000 --malformed-rate 0.1
+    python -m benchmarks.load_test --sessions 60 --base-url http://127.0.0.1:8765/v1   # external mock
+"""
+import argparse
+import math
+import random
+import statistics
+import threading
+import time
+
+from openai import OpenAI
+
+from admission import AdmissionController
+from card_image import make_card_image
+from mock_openai import add_config_args, config_from_args, start_mock_server
+from persona import PERSONA_MODEL, PERSONA_TEXT_FORMAT, TONES, build_persona_prompt, finish_persona, format_stats
+
+FAVORITES = ["dosa", "cricket", "teddy bear", "Tom & Jerry", "hide-and-seek", "kites", "lego", "mangoes"]
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def run_session(i: int, client, admission, stream: bool, think_s: float, results: list, lock) -> None:
+    time.sleep(random.uniform(0, think_s))  # users don't all click in the same millisecond
+    prompt = build_persona_prompt(f"Student {i}", random.choice(FAVORITES), random.choice(TONES), True)
+
+    def request():
+        if not stream:
+            return client.responses.create(model=PERSONA_MODEL, input=prompt, text=PERSONA_TEXT_FORMAT).output_text
+        events = client.responses.create(model=PERSONA_MODEL, input=prompt, text=PERSONA_TEXT_FORMAT, stream=True)
+        return "".join(e.delta for e in events if e.type == "response.output_text.delta")
+
+    t0 = time.perf_counter()
+    error = None
+    try:
+        card = finish_persona(client, admission.run(request), prompt, run=admission.run)
+        make_card_image(card)
+    except Exception as ex:
+        error = f"{type(ex).__name__}: {ex}"
+    elapsed = time.perf_counter() - t0
+    with lock:
+        results.append((elapsed, error))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate N concurrent app.py sessions against the mock API.")
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--think", type=float, default=2.0, help="sessions click at a random time in [0, think] s")
+    parser.add_argument("--no-stream", dest="stream", action="store_false")
+    parser.add_argument("--base-url", default=None, help="use an already running mock instead of an in-process one")
+    parser.add_argument("--rate-per-min", type=float, default=600)
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    base_url = args.base_url
+    if base_url is None:
+        _, base_url = start_mock_server(config_from_args(args))
+    client = OpenAI(api_key="sk-mock", base_url=base_url, max_retries=0)
+    admission = AdmissionController(args.rate_per_min / 60, args.burst, args.max_in_flight, base_backoff=0.5)
+
+    make_card_image({})  # warm the font/template caches like a running app would have
+    results, lock = [], threading.Lock()
+    threads = [threading.Thread(target=run_session, args=(i, client, admission, args.stream, args.think, results, lock))
+               for i in range(args.sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    ok = sorted(e for e, err in results if err is None)
+    errors = [err for _, err in results if err is not None]
+    print(f"{args.sessions} sessions, latency {args.latency}, stream={args.stream}, wall {wall:.2f}s")
+    print(f"  end-to-end ms  p50 {percentile(ok, 50) * 1000:8.1f}  p95 {percentile(ok, 95) * 1000:8.1f}"
+          f"  p99 {percentile(ok, 99) * 1000:8.1f}  mean {statistics.fmean(ok) * 1000 if ok else float('nan'):8.1f}")
+    print(f"  throughput     {len(ok) / wall:.2f} cards/s   errors {len(errors)}   429 pauses {admission.rate_limited}")
+    print(f"  output format  {format_stats.snapshot()}")
+    for err in sorted(set(errors))[:5]:
+        print(f"  error: {err}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Startup, memory and per-word draw time of the indexed word list (word_index.py) on a large
+synthetic lexicon, against loading the same "word count" text file into a Python list.
+
+Writes a lexicon of N random words with Zipf-like counts to a temp dir, builds the index from
+it, then reports for each approach: time to open/load, resident memory added, and the time to
+draw a 60-word no-repeat deck for each difficulty.
+
+Run from the repo root:  python -m benchmarks.word_index [words]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import word_index
+from word_index import DIFFICULTIES, WordIndex, build_index, read_counts
+
+DECK = 60
+
+
+def rss_kb() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def write_lexicon(path: str, n: int) -> None:
+    rng = random.Random(5)
+    words = set()
+    while len(words) < n:
+        length = min(max(int(rng.gauss(8, 2.5)), 3), 15)
+        words.add("".join(rng.choice(word_index.LETTERS) for _ in range(length)))
+    with open(path, "w", encoding="utf-8") as f:
+        for rank, w in enumerate(words):
+            f.write(f"{w}\t{10 ** 9 // (rank + 1)}\n")
+
+
+def list_deck(words: list, difficulty: str, rng) -> list:
+    """The plain-list way: filter the whole list for the difficulty, then sample."""
+    (shortest, longest), (_, rare) = DIFFICULTIES[difficulty]
+    max_rank = word_index.BAND_RANKS[rare] if rare < len(word_index.BAND_RANKS) else len(words)
+    pool = [w for w in words[:max_rank] if shortest <= len(w) <= longest]
+    return rng.sample(pool, min(DECK, len(pool)))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 150000
+    with tempfile.TemporaryDirectory() as tmp:
+        text, index_path = os.path.join(tmp, "words.tsv"), os.path.join(tmp, "words.idx")
+        write_lexicon(text, n)
+        t = time.perf_counter()
+        build_index(read_counts(text), index_path)
+        print(f"{n:,} words: text {os.path.getsize(text) / 1e6:.1f} MB, index {os.path.getsize(index_path) / 1e6:.1f} MB,"
+              f" built in {time.perf_counter() - t:.2f}s")
+        rng = random.Random(1)
+
+        rss, t = rss_kb(), time.perf_counter()
+        index = WordIndex(index_path)
+        opened, rss_index = (time.perf_counter() - t) * 1000, rss_kb() - rss
+        draws = {}
+        for name in DIFFICULTIES:
+            times = []
+            for _ in range(20):
+                t = time.perf_counter()
+                deck = index.deck(name, rng=rng)
+                [deck.pop() for _ in range(DECK)]
+                times.append((time.perf_counter() - t) * 1000)
+            draws[name] = statistics.median(times)
+        rss_index_after = rss_kb() - rss
+        print(f"  {'word index':<12} open {opened:8.2f} ms   +{rss_index:>7,} KB RSS (+{rss_index_after:,} KB after decks)   "
+              + "   ".join(f"{k} {v:.2f} ms" for k, v in draws.items()))
+
+        rss, t = rss_kb(), time.perf_counter()
+        counts = read_counts(text)
+        words = sorted(counts, key=lambda w: (-counts[w], w))
+        loaded, rss_list = (time.perf_counter() - t) * 1000, rss_kb() - rss
+        draws = {}
+        for name in DIFFICULTIES:
+            times = []
+            for _ in range(20):
+                t = time.perf_counter()
+                list_deck(words, name, rng)
+                times.append((time.perf_counter() - t) * 1000)
+            draws[name] = statistics.median(times)
+        print(f"  {'text list':<12} load {loaded:8.2f} ms   +{rss_list:>7,} KB RSS{'':>24}"
+              + "   ".join(f"{k} {v:.2f} ms" for k, v in draws.items()))
+        print(f"  (decks of {DECK} words; times are medians of 20)")
+
+
+if __name__ == "__main__":
+    main()
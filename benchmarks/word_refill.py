@@ -0,0 +1,57 @@
+"""
+Deck refill benchmark: the n-gram word generator (word_gen.py) against the consonant/vowel
+alternation refill_deck used before it.
+
+Reports training time, raw candidates per second, the share of candidates that are lexicon
+words, real unique words per second, and the time refill_deck takes for a 60-word deck.
+
+Run from the repo root:  python -m benchmarks.word_refill [candidates]
+"""
+import random
+import statistics
+import sys
+import time
+
+from word_gen import DEFAULT_WORD_LIST, WordGenerator, load_word_list
+
+
+def alternating_word(rng) -> str:
+    """The old generate_word: random consonant/vowel alternation, 5-9 letters."""
+    vowels, consonants = "aeiou", "bcdfghjklmnpqrstvwxyz"
+    start_consonant = rng.choice([True, False])
+    return "".join(rng.choice(consonants if (i % 2 == 0) == start_consonant else vowels)
+                   for i in range(rng.randint(5, 9)))
+
+
+def rate(label: str, candidates: list, seconds: float, lexicon) -> None:
+    real = [w for w in candidates if w in lexicon]
+    print(f"  {label:<22} {len(candidates) / seconds:>10,.0f} cand/s {len(real) / len(candidates):>7.1%} real"
+          f" {len(set(real)) / seconds:>10,.0f} unique real words/s")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    words = load_word_list(DEFAULT_WORD_LIST)
+    t = time.perf_counter()
+    gen = WordGenerator(words)
+    print(f"word_list.txt: {len(words)} words; order-{gen.order} model trained in {(time.perf_counter() - t) * 1000:.1f} ms"
+          f" ({len(gen.contexts)} contexts, {len(gen.cum)} transitions)")
+
+    rng = random.Random(1)
+    t = time.perf_counter()
+    old = [alternating_word(rng) for _ in range(n)]
+    rate("alternation (old)", old, time.perf_counter() - t, gen.lexicon)
+    t = time.perf_counter()
+    new = gen.generate(n, rng)
+    rate("n-gram generate()", new, time.perf_counter() - t, gen.lexicon)
+
+    times = []
+    for _ in range(50):
+        t = time.perf_counter()
+        deck = gen.real_words(60, exclude=words[:38], rng=rng)
+        times.append((time.perf_counter() - t) * 1000)
+    print(f"  real_words(60): median {statistics.median(times):.1f} ms, max {max(times):.1f} ms, {len(deck)} words")
+
+
+if __name__ == "__main__":
+    main()
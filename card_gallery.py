@@ -0,0 +1,142 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    hash        TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    name_key    TEXT NOT NULL,
+    event_date  TEXT NOT NULL,  -- first event; every event the card was served at is in card_events
+    card_json   TEXT NOT NULL,
+    created_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cards_by_name ON cards (name_key, event_date);
+CREATE INDEX IF NOT EXISTS cards_by_date ON cards (event_date);
+CREATE TABLE IF NOT EXISTS card_events (
+    hash        TEXT NOT NULL,
+    event_date  TEXT NOT NULL,
+    name_key    TEXT NOT NULL,
+    seen_at     REAL NOT NULL,
+    PRIMARY KEY (hash, event_date)
+);
+CREATE INDEX IF NOT EXISTS card_events_by_name ON card_events (name_key, event_date);
+CREATE INDEX IF NOT EXISTS card_events_by_date ON card_events (event_date);
+CREATE TABLE IF NOT EXISTS card_images (
+    hash        TEXT NOT NULL,
+    event_date  TEXT NOT NULL,  -- the "Generated on" date in the image footer
+    fmt         TEXT NOT NULL,
+    data        BLOB NOT NULL,
+    PRIMARY KEY (hash, event_date, fmt)
+);
+"""
+
+# Galleries written before card_events/card_images kept one date per card and images keyed by hash only
+MIGRATE_V1 = """
+INSERT OR IGNORE INTO card_events (hash, event_date, name_key, seen_at)
+    SELECT hash, event_date, name_key, created_at FROM cards;
+INSERT OR IGNORE INTO card_images (hash, event_date, fmt, data)
+    SELECT i.hash, c.event_date, i.fmt, i.data FROM images i JOIN cards c ON c.hash = i.hash;
+DROP TABLE images;
+"""
+
+
+def card_hash(card: dict) -> str:
+    """Content hash of a card: same JSON (in any key order) -> same hash."""
+    canonical = json.dumps(card, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+class CardGallery:
+    """
+    Persistent store of generated cards in SQLite. Each card's JSON is stored once under the
+    card's content hash, with one row per event date it was served at (indexed by name and date),
+    so "find my card" can hand back the stored bytes without the LLM or PIL. Images are kept per
+    event date because the footer says when the card was generated.
+    """
+
+    def __init__(self, path: str = "card_gallery.sqlite3"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        if self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'images'").fetchone():
+            with self._db:
+                self._db.executescript(MIGRATE_V1)
+
+    def save(self, card: dict, images: dict, event_date: str | None = None) -> str:
+        """
+        Record the card as served at `event_date` (default today) and store its images ({fmt: bytes},
+        rendered with that date in the footer) if not already there. Returns the hash.
+        """
+        h = card_hash(card)
+        name = str(card.get("name", ""))
+        event_date = event_date or date.today().isoformat()
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO cards (hash, name, name_key, event_date, card_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (h, name, name_key(name), event_date, json.dumps(card, ensure_ascii=False), now),
+            )
+            self._db.execute(
+                "INSERT INTO card_events (hash, event_date, name_key, seen_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (hash, event_date) DO UPDATE SET seen_at = excluded.seen_at",
+                (h, event_date, name_key(name), now),
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO card_images (hash, event_date, fmt, data) VALUES (?, ?, ?, ?)",
+                [(h, event_date, fmt, sqlite3.Binary(data)) for fmt, data in images.items()],
+            )
+        return h
+
+    def find(self, name: str, event_date: str | None = None, limit: int = 10) -> list:
+        """Newest cards for a name (optionally on one event date): [{hash, name, event_date, persona_name}]."""
+        sql = ("SELECT e.hash, c.name, e.event_date, c.card_json FROM card_events e "
+               "JOIN cards c ON c.hash = e.hash WHERE e.name_key = ?")
+        params = [name_key(name)]
+        if event_date:
+            sql += " AND e.event_date = ?"
+            params.append(event_date)
+        sql += " ORDER BY e.seen_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            {"hash": h, "name": n, "event_date": d, "persona_name": json.loads(c).get("persona_name", "")}
+            for h, n, d, c in rows
+        ]
+
+    def get_card(self, h: str):
+        with self._lock:
+            row = self._db.execute("SELECT card_json FROM cards WHERE hash = ?", (h,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_image(self, h: str, fmt: str = "png", event_date: str | None = None):
+        """The image rendered for `event_date` (default today), or None: another day's footer would be wrong."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM card_images WHERE hash = ? AND event_date = ? AND fmt = ?",
+                (h, event_date or date.today().isoformat(), fmt),
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def image_formats(self, h: str, event_date: str | None = None) -> list:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT fmt FROM card_images WHERE hash = ? AND event_date = ? ORDER BY fmt",
+                (h, event_date or date.today().isoformat()),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
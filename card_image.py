@@ -0,0 +1,136 @@
+import io
+import textwrap
+from datetime import datetime
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+W, H = 1024, 1024
+
+# Output formats: name -> (PIL format, save options, mime type, file extension)
+CARD_FORMATS = {
+    "png": ("PNG", {}, "image/png", "png"),
+    "webp": ("WEBP", {"method": 4}, "image/webp", "webp"),
+    "jpeg": ("JPEG", {"optimize": True, "progressive": True}, "image/jpeg", "jpg"),
+}
+LOSSY_FORMATS = {"webp", "jpeg"}
+THUMBNAIL_SIZE = 384
+
+# -----------------------------
+# Cached resources
+# Module-level caches live for the whole process, so they survive Streamlit reruns.
+# -----------------------------
+@lru_cache(maxsize=None)
+def load_font(size: int):
+    """Resolve a TrueType font once per size (fallback to default if fonts not found)."""
+    for f in ["arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf"]:
+        try:
+            return ImageFont.truetype(f, size)
+        except Exception:
+            continue
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=1)
+def card_template():
+    """The static card background: panels, face doodle and fixed labels. Drawn once."""
+    img = Image.new("RGB", (W, H), (250, 250, 255))
+    d = ImageDraw.Draw(img)
+    font_title = load_font(64)
+    font_sub = load_font(36)
+
+    # Background shapes
+    d.rounded_rectangle([40, 40, W-40, H-40], radius=40, fill=(255, 255, 255))
+    d.rounded_rectangle([70, 90, W-70, 240], radius=30, fill=(230, 245, 255))
+    d.ellipse([90, 280, 420, 610], fill=(255, 245, 220), outline=(200, 200, 200), width=4)  # "face" placeholder
+    d.rounded_rectangle([460, 280, W-90, 610], radius=25, fill=(245, 235, 255), outline=(220, 210, 240), width=3)
+
+    # Cute doodles
+    d.ellipse([150, 360, 200, 410], fill=(0, 0, 0))
+    d.ellipse([300, 360, 350, 410], fill=(0, 0, 0))
+    d.arc([200, 420, 320, 520], start=10, end=170, fill=(0, 0, 0), width=6)  # smile
+    d.text((130, 620), "🙂", font=font_title, fill=(0, 0, 0))
+    d.text((210, 630), "Inner Child Mode: ON", font=font_sub, fill=(40, 40, 60))
+
+    # Predictions panel
+    d.rounded_rectangle([70, 700, W-70, 930], radius=30, fill=(235, 255, 240), outline=(190, 230, 200), width=3)
+    d.text((95, 720), "🔮 Happy Predictions", font=font_sub, fill=(10, 80, 40))
+    return img
+
+# -----------------------------
+# Card renderer
+# -----------------------------
+def render_card(card: dict):
+    """
+    Generate a simple 'cartoon card' image locally using PIL.
+    No external images needed (demo-safe).
+    Only the card text is drawn per call; the background comes from card_template().
+    """
+    img = card_template().copy()
+    d = ImageDraw.Draw(img)
+
+    font_title = load_font(64)
+    font_sub = load_font(36)
+    font_body = load_font(30)
+    font_small = load_font(26)
+
+    # Title
+    d.text((90, 115), f"{card.get('card_title','Inner Child Cartoon')}", font=font_title, fill=(20, 40, 80))
+
+    # Right block info
+    x0, y0 = 490, 300
+    d.text((x0, y0), f"Name: {card.get('name','')}", font=font_sub, fill=(60, 30, 90))
+    d.text((x0, y0+55), f"Favorite: {card.get('favorite','')}", font=font_body, fill=(60, 30, 90))
+
+    persona = card.get("persona_name", "The Joy Keeper")
+    tagline = card.get("tagline", "Smiles in small moments.")
+    superpower = card.get("superpower", "Warmth Boost")
+    comfort = card.get("comfort_snack", "Hot chocolate")
+    catchphrase = card.get("catchphrase", "We got this!")
+
+    # Wrap helper
+    def draw_wrapped(label, text, y, max_width_chars=34):
+        d.text((x0, y), label, font=font_small, fill=(90, 70, 120))
+        wrapped = "\n".join(textwrap.wrap(text, width=max_width_chars))
+        d.text((x0, y+32), wrapped, font=font_body, fill=(40, 20, 70))
+        return y + 32 + (len(wrapped.splitlines()) * 34) + 18
+
+    y = 380
+    y = draw_wrapped("Persona:", persona, y)
+    y = draw_wrapped("Tagline:", tagline, y)
+    y = draw_wrapped("Superpower:", superpower, y)
+    y = draw_wrapped("Comfort snack:", comfort, y)
+    y = draw_wrapped("Catchphrase:", catchphrase, y)
+
+    # Predictions at bottom
+    preds = card.get("predictions", [])
+    py = 780
+    for i, p in enumerate(preds[:3], start=1):
+        line = f"{i}. {p}"
+        wrapped = "\n".join(textwrap.wrap(line, width=60))
+        d.text((95, py), wrapped, font=font_body, fill=(10, 60, 30))
+        py += 42 + (len(wrapped.splitlines()) * 32)
+
+    # Footer
+    footer = f"Generated on {datetime.now().strftime('%d %b %Y')}  •  Just for fun ✨"
+    d.text((90, 955), footer, font=font_small, fill=(120, 120, 140))
+
+    return img
+
+def encode_image(img, fmt: str = "png", quality: int = 85) -> bytes:
+    """Encode to one of CARD_FORMATS in memory. `quality` only applies to webp/jpeg."""
+    pil_format, options, _, _ = CARD_FORMATS[fmt]
+    if fmt in LOSSY_FORMATS:
+        options = {**options, "quality": quality}
+    buf = io.BytesIO()
+    img.save(buf, format=pil_format, **options)
+    return buf.getvalue()
+
+def make_thumbnail(img, size: int = THUMBNAIL_SIZE, quality: int = 80) -> bytes:
+    """Small WebP preview of a rendered card, for showing on screen."""
+    thumb = img.copy()
+    thumb.thumbnail((size, size), Image.LANCZOS, reducing_gap=2.0)
+    return encode_image(thumb, "webp", quality)
+
+def make_card_image(card: dict, fmt: str = "png", quality: int = 85) -> bytes:
+    """Render the card into in-memory bytes. No files are touched, so concurrent sessions can't collide."""
+    return encode_image(render_card(card), fmt, quality)
@@ -0,0 +1,469 @@
+"""
+Classroom server: many IntelliSpell sessions in one asyncio process, played from a browser.
+
+    python classroom_server.py                  # students open http://<this machine>:8800/
+    python classroom_server.py --no-ai          # clue pack + built-in clues only, no API calls
+    python classroom_server.py --difficulty easy  # decks from the word index (word_index.py)
+
+Every browser tab is one session running the spell_engine rules. Key presses go up as small
+POSTs and the session's state comes back as a Server-Sent Events stream: one JSON snapshot
+per change, coalesced so a slow client only ever gets the latest one. All sessions share the
+word list and one clue service, so each word's clues are resolved once for the whole class.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from clue_pack import DEFAULT_PACK, load_clue_pack
+from spell_engine import (
+    BACKSPACE, ENTER, GAME_OVER, NAME, PLAY, SHOW_ANSWER, SHOW_CORRECT,
+    Rules, clues_arrived, deal, has_timer, mask_word, needs_word, new_game, press, tick,
+)
+from word_deck import build_deck, refill_deck
+
+RULES = Rules(lives_per_word=3, max_failed_words=5, show_correct_ms=2000)
+GENERATED_WORDS_COUNT = 60
+PREFER_CLUE_PACK = False  # True: words in the clue pack skip the API (for packs compiled with clue_pack.py)
+LOOKAHEAD = 4             # upcoming deck words whose clues are resolved ahead of time
+SESSION_IDLE_S = 30 * 60  # sessions with no open stream are dropped after this long
+KEEPALIVE_S = 15
+
+# -----------------------------
+# Clues (shared by all sessions)
+# -----------------------------
+def make_resolver(use_ai: bool, model: str):
+    """(resolve, fallback) clue functions: cache / AI, then the clue pack, then letter hints."""
+    pack = load_clue_pack(os.getenv("CLUE_PACK_FILE", DEFAULT_PACK))
+
+    def builtin_clues(word):
+        if word in pack:
+            return pack[word]
+        vowels = sum(1 for ch in word if ch in "aeiou")
+        return [
+            f"This word has {len(word)} letters.",
+            f"It starts with '{word[0]}' and has {vowels} vowel(s).",
+            f"It ends with '{word[-1]}'.",
+        ]
+
+    if not use_ai:
+        return builtin_clues, builtin_clues
+
+    from openai import OpenAI
+
+    from clue_cache import ClueCache
+    from clues import request_ai_clues
+
+    api_key = (os.getenv("OPENAI_API_KEY") or "").strip().strip('"').strip("'")
+    client = OpenAI(api_key=api_key) if api_key else None
+    cache = ClueCache.from_env()
+    if not client:
+        print("[Classroom] Missing OPENAI_API_KEY in environment/.env; using built-in clues")
+
+    def resolve(word):
+        if not client or (PREFER_CLUE_PACK and word in pack):
+            return builtin_clues(word)
+        cached = cache.get(word, model)
+        if cached:
+            return cached
+        clues = request_ai_clues(client, word, model)
+        if not clues:
+            return builtin_clues(word)
+        cache.put(word, model, clues)
+        return clues
+
+    return resolve, builtin_clues
+
+
+class ClueService:
+    """Each word is resolved once on a small thread pool, however many sessions ask for it."""
+
+    def __init__(self, resolve, fallback, workers: int = 4, max_words: int = 5000):
+        self.resolve = resolve
+        self.fallback = fallback
+        self.max_words = max_words
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="classroom-clues")
+        self._pending = {}          # word -> asyncio.Future
+        self._done = OrderedDict()  # word -> clues, least recently used first
+
+    def prefetch(self, words) -> None:
+        for word in words:
+            if word not in self._done:
+                self._lookup(word)
+
+    def take(self, word):
+        """(clues, is_fallback) right away."""
+        if word in self._done:
+            self._done.move_to_end(word)
+            return self._done[word], False
+        self._lookup(word)
+        return self.fallback(word), True
+
+    async def wait(self, word):
+        if word in self._done:
+            return self._done[word]
+        return await asyncio.shield(self._lookup(word))
+
+    def __len__(self):
+        return len(self._done)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _lookup(self, word):
+        future = self._pending.get(word)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self._pool, self._resolve, word)
+            future.add_done_callback(lambda f: self._finish(word, f))
+            self._pending[word] = future
+        return future
+
+    def _resolve(self, word):
+        try:
+            return self.resolve(word)
+        except Exception as ex:
+            print(f"[Classroom] Clue lookup failed for '{word}': {ex}")
+            return self.fallback(word)
+
+    def _finish(self, word, future) -> None:
+        self._pending.pop(word, None)
+        if not future.cancelled():
+            self._done[word] = future.result()
+            while len(self._done) > self.max_words:
+                self._done.popitem(last=False)
+
+# -----------------------------
+# Sessions
+# -----------------------------
+class Subscriber:
+    """One open event stream. Keeps only the newest snapshot, so slow clients can't pile up a backlog."""
+
+    def __init__(self):
+        self._latest = None
+        self._ready = asyncio.Event()
+
+    def offer(self, payload: str) -> None:
+        self._latest = payload
+        self._ready.set()
+
+    async def next(self) -> str:
+        await self._ready.wait()
+        self._ready.clear()
+        payload, self._latest = self._latest, None
+        return payload
+
+
+class Session:
+    def __init__(self, session_id: str, rules: Rules, deck: list, rng: random.Random):
+        self.id = session_id
+        self.state = new_game(rules)
+        self.deck = deck
+        self.rng = rng  # every deck of this session (first, restarts and refills) is drawn from it
+        self.ack = 0  # seq of the last key press applied (echoed so clients can time round trips)
+        self.subscribers = set()
+        self.timer = None
+        self.tasks = set()  # late-clue waits; asyncio only keeps weak references to tasks
+        self.last_seen = time.monotonic()
+
+
+def view(session: Session) -> dict:
+    """What the browser needs to draw the screen. The word itself is only sent once it may be shown."""
+    s = session.state
+    clue = s.clue_text if len(s.clue_text) <= 55 else s.clue_text[:55] + "..."
+    shown = {SHOW_ANSWER: s.current_word, SHOW_CORRECT: s.correct_word}.get(s.phase, "")
+    return {
+        "phase": s.phase, "player": s.player_name, "typed": s.typed.upper(),
+        "mask": mask_word(s.current_word, s.revealed_count) if s.phase == PLAY else "",
+        "clue": clue if s.phase == PLAY else "", "lives": s.lives, "score": s.score,
+        "failed": s.failed_words, "max_failed": s.rules.max_failed_words, "word": shown.upper(),
+        "ack": session.ack,
+    }
+
+
+class Classroom:
+    def __init__(self, words, clues: ClueService, rules: Rules = RULES, difficulty: str = None):
+        self.words = list(words)
+        self.difficulty = difficulty
+        self.clues = clues
+        self.rules = rules
+        self.sessions = {}
+        self.keys = 0
+
+    def now_ms(self) -> int:
+        return int(asyncio.get_running_loop().time() * 1000)
+
+    def session(self, session_id: str | None) -> Session:
+        """The session with this id, or a new one."""
+        s = self.sessions.get(session_id or "")
+        if s is None:
+            rng = random.Random()
+            s = Session(secrets.token_urlsafe(8), self.rules, build_deck(self.words, self.difficulty, rng), rng)
+            self.sessions[s.id] = s
+            self.clues.prefetch(s.deck[-LOOKAHEAD:])
+        s.last_seen = time.monotonic()
+        return s
+
+    def key(self, s: Session, key: str, seq: int = 0) -> None:
+        restarting = s.state.phase == GAME_OVER
+        s.state = press(s.state, key, self.now_ms())
+        if restarting and s.state.phase == NAME:
+            s.deck = build_deck(self.words, self.difficulty, s.rng)
+            self.clues.prefetch(s.deck[-LOOKAHEAD:])
+        s.ack = max(s.ack, seq)
+        s.last_seen = time.monotonic()
+        self.keys += 1
+        self._settle(s)
+        self.publish(s)
+
+    def publish(self, s: Session) -> None:
+        payload = json.dumps(view(s))
+        for sub in s.subscribers:
+            sub.offer(payload)
+
+    def _settle(self, s: Session) -> None:
+        """Deal a word if the engine wants one, arm the phase timer and wait for late clues."""
+        if needs_word(s.state):
+            if not s.deck:
+                s.deck = refill_deck(self.words, True, GENERATED_WORDS_COUNT, s.rng, self.difficulty)
+            word = s.deck.pop()
+            clues, is_fallback = self.clues.take(word)
+            self.clues.prefetch(s.deck[-LOOKAHEAD:])
+            s.state = deal(s.state, word, clues, is_fallback)
+            if is_fallback:
+                task = asyncio.get_running_loop().create_task(self._late_clues(s, word))
+                s.tasks.add(task)
+                task.add_done_callback(lambda t: self._task_done(s, t))
+        if s.timer:
+            s.timer.cancel()
+            s.timer = None
+        if has_timer(s.state):
+            delay = max(0, s.state.timer_until - self.now_ms()) / 1000 + 0.001
+            s.timer = asyncio.get_running_loop().call_later(delay, self._on_timer, s)
+
+    def _on_timer(self, s: Session) -> None:
+        s.timer = None
+        s.state = tick(s.state, self.now_ms())
+        self._settle(s)
+        self.publish(s)
+
+    async def _late_clues(self, s: Session, word: str) -> None:
+        clues = await self.clues.wait(word)
+        if s.state.current_word == word and s.state.clues_are_fallback:
+            s.state = clues_arrived(s.state, clues)
+            self.publish(s)
+
+    def _task_done(self, s: Session, task) -> None:
+        s.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[Classroom] Late clue update failed: {task.exception()!r}")
+
+    def expire(self) -> int:
+        cutoff = time.monotonic() - SESSION_IDLE_S
+        stale = [sid for sid, s in self.sessions.items() if not s.subscribers and s.last_seen < cutoff]
+        for sid in stale:
+            s = self.sessions.pop(sid)
+            if s.timer:
+                s.timer.cancel()
+            for task in list(s.tasks):
+                task.cancel()
+        return len(stale)
+
+# -----------------------------
+# Browser client
+# -----------------------------
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>IntelliSpell</title>
+<style>
+ body { background:#14182d; color:#fff; font:20px "Segoe UI",sans-serif; margin:24px; }
+ .small { color:#c8c8c8; font-size:16px; } .big { font-size:34px; font-weight:bold; letter-spacing:2px; }
+ .label { color:#ffffb4; } .clue { color:#c8c8ff; } .lives { color:#ffc8c8; } .score { color:#b4ffc8; }
+ .good { color:#64ff64; } .bad { color:#ff6464; } #typed { min-height:1.4em; }
+</style></head>
+<body>
+<div class="small">Skillful Saturday | Motilal Forma Santana Dharma Higher Secondary School</div>
+<h1>IntelliSpell – AI Word Challenge</h1>
+<div id="player"></div><div id="score" class="score"></div>
+<div id="screen"></div>
+<div id="typed" class="big"></div>
+<script>
+let session = sessionStorage.getItem("intellispell"), seq = 0, last = null;
+const $ = id => document.getElementById(id);
+const esc = t => String(t).replace(/[&<>"]/g, c => ({"&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;"}[c]));
+function connect() {
+  const es = new EventSource("/events" + (session ? "?session=" + session : ""));
+  es.addEventListener("session", e => { session = JSON.parse(e.data).id; sessionStorage.setItem("intellispell", session); });
+  es.onmessage = e => draw(JSON.parse(e.data));
+}
+function draw(s) {
+  last = s;
+  $("player").textContent = s.player && s.phase !== "NAME" ? "Player: " + s.player : "";
+  $("score").textContent = "Score: " + s.score + "   Failed: " + s.failed + "/" + s.max_failed;
+  let html = "", typed = "";
+  if (s.phase === "NAME") { html = '<p class="label">Enter your name and press ENTER:</p>'; typed = s.player; }
+  else if (s.phase === "PLAY") {
+    html = '<p class="label">Guess the word:</p><p class="big">' + esc(s.mask) + '</p>' +
+           '<p class="clue">AI Clue:</p><p>' + esc(s.clue) + '</p><p class="lives">Lives left: ' + s.lives +
+           '</p><p class="good">Your answer:</p>';
+    typed = s.typed;
+  }
+  else if (s.phase === "SHOW_CORRECT") html = '<p class="big good">Great! You guessed it right.</p><p>Word is:</p><p class="big">' + esc(s.word) + '</p>';
+  else if (s.phase === "SHOW_ANSWER") html = '<p class="big bad">Right Answer:</p><p class="big">' + esc(s.word) + '</p>';
+  else if (s.phase === "GAME_OVER") html = '<p class="big bad">GAME OVER</p><p>Final Score: ' + s.score + '</p><p class="small">Press ENTER to restart</p>';
+  $("screen").innerHTML = html;
+  $("typed").textContent = typed;
+}
+document.addEventListener("keydown", e => {
+  let key = e.key === "Enter" ? "enter" : e.key === "Backspace" ? "backspace" : e.key.length === 1 ? e.key : null;
+  if (!key || !session || e.ctrlKey || e.metaKey) return;
+  e.preventDefault();
+  fetch("/key?session=" + session + "&seq=" + (++seq), { method: "POST", body: key });
+});
+connect();
+</script>
+</body></html>
+"""
+
+# -----------------------------
+# HTTP
+# -----------------------------
+class ClassroomServer:
+    def __init__(self, classroom: Classroom):
+        self.classroom = classroom
+
+    async def handle(self, reader, writer) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target = request_line.split(" ")[:2]
+                headers = {k.strip().lower(): v.strip() for k, _, v in (h.partition(":") for h in header_lines if h)}
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+                url = urlsplit(target)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+                if method == "GET" and url.path == "/events":
+                    await self.stream(writer, query.get("session"))
+                    break
+                status, content_type, data = self.route(method, url.path, query, body)
+                writer.write(
+                    f"HTTP/1.1 {status}\r\ncontent-type: {content_type}\r\ncontent-length: {len(data)}\r\n"
+                    f"cache-control: no-store\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def route(self, method: str, path: str, query: dict, body: bytes):
+        if method == "GET" and path == "/":
+            return "200 OK", "text/html; charset=utf-8", PAGE.encode("utf-8")
+        if method == "POST" and path == "/key":
+            s = self.classroom.sessions.get(query.get("session", ""))
+            key = body.decode("utf-8", "replace")
+            if s is None:
+                return "404 Not Found", "text/plain", b"unknown session"
+            if key not in (ENTER, BACKSPACE) and len(key) != 1:
+                return "400 Bad Request", "text/plain", b"bad key"
+            self.classroom.key(s, key, int(query.get("seq") or 0))
+            return "204 No Content", "text/plain", b""
+        if method == "GET" and path == "/stats":
+            c = self.classroom
+            stats = {"sessions": len(c.sessions), "streams": sum(len(s.subscribers) for s in c.sessions.values()),
+                     "keys": c.keys, "clue_words": len(c.clues)}
+            return "200 OK", "application/json", json.dumps(stats).encode("utf-8")
+        return "404 Not Found", "text/plain", b"not found"
+
+    async def stream(self, writer, session_id: str | None) -> None:
+        s = self.classroom.session(session_id)
+        sub = Subscriber()
+        s.subscribers.add(sub)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\ncache-control: no-store\r\n\r\n")
+            writer.write(f"event: session\ndata: {json.dumps({'id': s.id})}\n\n".encode("utf-8"))
+            sub.offer(json.dumps(view(s)))
+            while True:
+                try:
+                    payload = await asyncio.wait_for(sub.next(), KEEPALIVE_S)
+                    writer.write(f"data: {payload}\n\n".encode("utf-8"))
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            s.subscribers.discard(sub)
+            s.last_seen = time.monotonic()
+
+
+async def serve(classroom: Classroom, host: str, port: int):
+    """Start listening. Returns the asyncio Server."""
+    return await asyncio.start_server(ClassroomServer(classroom).handle, host, port, backlog=1024)
+
+
+async def expire_sessions(classroom: Classroom) -> None:
+    while True:
+        await asyncio.sleep(60)
+        dropped = classroom.expire()
+        if dropped:
+            print(f"[Classroom] Dropped {dropped} idle session(s); {len(classroom.sessions)} left")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve IntelliSpell to a whole class from one machine.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--words", default=None, help="text file with one word per line (default: game WORDS)")
+    parser.add_argument("--difficulty", choices=["easy", "medium", "hard"], default=None,
+                        help="draw each session's deck from word_index.bin instead of the word list")
+    parser.add_argument("--no-ai", dest="ai", action="store_false", help="don't call the API for clues")
+    parser.add_argument("--model", default=None, help="default: OPENAI_MODEL or gpt-4.1")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+
+    from clue_cache import game_words
+
+    load_dotenv()  # before OPENAI_MODEL is read, so the server asks (and caches under) the same model as the games
+
+    if args.words:
+        with open(args.words, encoding="utf-8") as f:
+            words = [line.strip().lower() for line in f if line.strip()]
+    else:
+        words = game_words()
+    model = args.model or os.getenv("OPENAI_MODEL", "gpt-4.1")
+    resolve, fallback = make_resolver(args.ai, model)
+
+    async def run():
+        clues = ClueService(resolve, fallback)
+        classroom = Classroom(words, clues, difficulty=args.difficulty)
+        server = await serve(classroom, args.host, args.port)
+        expiry = asyncio.create_task(expire_sessions(classroom))
+        print(f"[Classroom] Serving {len(words)} words on http://{args.host}:{args.port}/  (Ctrl+C to stop)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+            clues.shutdown()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
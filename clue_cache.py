@@ -0,0 +1,171 @@
+"""
+Persistent on-disk cache of AI clues, keyed by word, model and prompt version.
+
+The games check it before calling the API. Pre-warm it for the whole deck before an event:
+
+    python clue_cache.py warm                      # WORDS from all three games, OPENAI_MODEL (gpt-4.1)
+    python clue_cache.py warm --model gpt-4o-mini  # the model intellispell.py uses
+    python clue_cache.py stats
+"""
+import argparse
+import ast
+import json
+import os
+import threading
+import time
+
+from clues import CLUE_PROMPT_VERSION
+
+GAME_SCRIPTS = ["intellispell.py", "Intellispell_v2.py", "intelliword.py"]
+
+
+class ClueCache:
+    """
+    JSON file of {key: {clues, stored_at, used_at}}. Writes are atomic (temp file + rename),
+    the least recently used entries are evicted past `max_entries`, and entries older than
+    `ttl_seconds` are ignored (0 = keep forever). Safe to use from the prefetch threads.
+    """
+
+    def __init__(self, path: str = "clue_cache.json", max_entries: int = 2000, ttl_seconds: float = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.getenv("CLUE_CACHE_FILE", "clue_cache.json"),
+            int(os.getenv("CLUE_CACHE_MAX", "2000")),
+            float(os.getenv("CLUE_CACHE_TTL_DAYS", "0")) * 86400,
+        )
+
+    @staticmethod
+    def key(word, model, prompt_version=CLUE_PROMPT_VERSION):
+        return f"{model}|v{prompt_version}|{word.lower()}"
+
+    def get(self, word, model, prompt_version=CLUE_PROMPT_VERSION):
+        k = self.key(word, model, prompt_version)
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is None:
+                return None
+            if self.ttl_seconds and time.time() - entry["stored_at"] > self.ttl_seconds:
+                del self._entries[k]
+                return None
+            entry["used_at"] = time.time()  # persisted with the next write
+            return list(entry["clues"])
+
+    def put(self, word, model, clues, prompt_version=CLUE_PROMPT_VERSION):
+        now = time.time()
+        with self._lock:
+            self._entries[self.key(word, model, prompt_version)] = {"clues": list(clues), "stored_at": now, "used_at": now}
+            if len(self._entries) > self.max_entries:
+                by_use = sorted(self._entries, key=lambda k: self._entries[k]["used_at"])
+                for k in by_use[:len(self._entries) - self.max_entries]:
+                    del self._entries[k]
+            self._save()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            self._entries = {}
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as ex:
+            print(f"[ClueCache] Could not write {self.path}: {ex}")
+
+
+def game_words(scripts=GAME_SCRIPTS):
+    """The WORDS list of each game script, read without running the game (it would open a window)."""
+    words = []
+    for script in scripts:
+        if not os.path.exists(script):
+            continue
+        with open(script, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), script)
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "WORDS" for t in node.targets):
+                words += [w for w in ast.literal_eval(node.value) if w not in words]
+    return words
+
+
+def warm(cache, words, model, workers=4):
+    """Fetch clues for every word not already cached. Returns (fetched, failed)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dotenv import load_dotenv
+    from openai import OpenAI
+
+    from clues import request_ai_clues
+
+    load_dotenv()
+    api_key = (os.getenv("OPENAI_API_KEY") or "").strip().strip('"').strip("'")
+    if not api_key:
+        raise SystemExit("OPENAI_API_KEY not found. Put it in a .env file.")
+    client = OpenAI(api_key=api_key)
+
+    todo = [w for w in words if cache.get(w, model) is None]
+    print(f"[ClueCache] {len(words) - len(todo)} of {len(words)} words already cached for {model}")
+
+    def fetch(word):
+        try:
+            return word, request_ai_clues(client, word, model)
+        except Exception as ex:
+            print(f"[ClueCache] '{word}' failed: {ex}")
+            return word, None
+
+    fetched = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for word, clues in pool.map(fetch, todo):
+            if clues:
+                cache.put(word, model, clues)
+                fetched += 1
+            else:
+                failed += 1
+    return fetched, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the on-disk AI clue cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm_cmd = sub.add_parser("warm", help="fetch clues for the whole deck before an event")
+    warm_cmd.add_argument("--model", default=None, help="default: OPENAI_MODEL or gpt-4.1")
+    warm_cmd.add_argument("--words", default=None, help="text file with one word per line (default: game WORDS)")
+    warm_cmd.add_argument("--workers", type=int, default=4)
+    sub.add_parser("stats", help="show how many clue sets are cached")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    cache = ClueCache.from_env()
+    if args.command == "stats":
+        print(f"{cache.path}: {len(cache)} cached clue sets")
+        return
+
+    model = args.model or os.getenv("OPENAI_MODEL", "gpt-4.1")
+    if args.words:
+        with open(args.words, encoding="utf-8") as f:
+            words = [line.strip().lower() for line in f if line.strip()]
+    else:
+        words = game_words()
+    fetched, failed = warm(cache, words, model, args.workers)
+    print(f"[ClueCache] Fetched {fetched}, failed {failed}; {len(cache)} entries in {cache.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Offline clue-pack compiler: asks for clues for many words per structured request and writes
+a versioned clue pack (clue_pack.json) that the games load at startup.
+
+    python clue_pack.py                          # WORDS from the games, merged into clue_pack.json
+    python clue_pack.py words.txt --batch-size 50 --out clue_pack.json
+    python clue_pack.py words.txt --refresh      # re-ask for words already in the pack
+
+Every result is checked (exactly three non-empty hints, none containing the word) and words
+that fail are asked for again in a later batch, up to --rounds times.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+CLUE_PACK_VERSION = 1
+DEFAULT_PACK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clue_pack.json")
+BATCH_SIZE = 50
+
+CLUE_PACK_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "clue_pack",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "clues": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "word": {"type": "string"},
+                            "hints": {"type": "array", "items": {"type": "string"}},
+                        },
+                        "required": ["word", "hints"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["clues"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# -----------------------------
+# Loading (used by the games)
+# -----------------------------
+def valid_hints(word, hints) -> bool:
+    """Exactly three non-empty hints and none of them gives the word away."""
+    if not isinstance(hints, list) or len(hints) != 3:
+        return False
+    word = word.casefold()
+    return all(isinstance(h, str) and h.strip() and word not in h.casefold() for h in hints)
+
+def load_clue_pack(path: str = DEFAULT_PACK) -> dict:
+    """{word: [hint, hint, hint]} from a clue pack, or {} if it is missing or from another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            pack = json.load(f)
+    except (OSError, ValueError) as ex:
+        print(f"[CluePack] Could not load {path}: {ex}")
+        return {}
+    if pack.get("version") != CLUE_PACK_VERSION:
+        print(f"[CluePack] {path} is version {pack.get('version')}, expected {CLUE_PACK_VERSION}; ignoring it")
+        return {}
+    return {w.lower(): h for w, h in pack.get("clues", {}).items() if valid_hints(w, h)}
+
+def save_clue_pack(path: str, clues: dict, model: str) -> None:
+    pack = {
+        "version": CLUE_PACK_VERSION,
+        "model": model,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "clues": dict(sorted(clues.items())),
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pack, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+# -----------------------------
+# Compiling
+# -----------------------------
+def batch_prompt(words) -> str:
+    return (
+        "For each word below, give THREE progressive hints for kids to guess the word. "
+        "Each hint should be more helpful than the previous one. "
+        "Do NOT use the word itself (or any form of it) in any hint. Keep each hint short.\n"
+        "Return one entry per word, using the word exactly as written.\n"
+        "Words:\n" + "\n".join(f"- {w}" for w in words)
+    )
+
+def request_batch(client, words, model) -> dict:
+    """One structured request for a batch of words -> {word: hints}. Failures return {}."""
+    try:
+        r = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": batch_prompt(words)}],
+            response_format=CLUE_PACK_FORMAT,
+            temperature=0.7
+        )
+        data = json.loads(r.choices[0].message.content)
+        return {str(item.get("word", "")).strip().lower(): item.get("hints") for item in data.get("clues", [])}
+    except Exception as ex:
+        print(f"[CluePack] Batch of {len(words)} words failed: {ex}")
+        return {}
+
+def compile_clues(client, words, model, batch_size: int = BATCH_SIZE, workers: int = 4, rounds: int = 3):
+    """Returns (clues, rejected_words, requests_made)."""
+    pending = list(dict.fromkeys(w.lower() for w in words))
+    clues, requests = {}, 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for round_no in range(1, rounds + 1):
+            if not pending:
+                break
+            batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            results = pool.map(lambda batch: request_batch(client, batch, model), batches)
+            requests += len(batches)
+            rejected = []
+            for batch, result in zip(batches, results):
+                for word in batch:
+                    hints = result.get(word)
+                    if valid_hints(word, hints):
+                        clues[word] = [h.strip() for h in hints]
+                    else:
+                        rejected.append(word)
+            print(f"[CluePack] Round {round_no}: {len(batches)} requests, "
+                  f"{len(pending) - len(rejected)} accepted, {len(rejected)} to retry")
+            pending = rejected
+    return clues, pending, requests
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a clue pack for the IntelliSpell games.")
+    parser.add_argument("words", nargs="?", help="text file with one word per line (default: game WORDS)")
+    parser.add_argument("--out", default=DEFAULT_PACK)
+    parser.add_argument("--model", default=None, help="default: OPENAI_MODEL or gpt-4.1")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=3, help="attempts per word before giving up on it")
+    parser.add_argument("--refresh", action="store_true", help="ask again for words already in the pack")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from openai import OpenAI
+
+    from clue_cache import game_words
+
+    load_dotenv()
+    api_key = (os.getenv("OPENAI_API_KEY") or "").strip().strip('"').strip("'")
+    if not api_key:
+        raise SystemExit("OPENAI_API_KEY not found. Put it in a .env file.")
+    model = args.model or os.getenv("OPENAI_MODEL", "gpt-4.1")
+
+    if args.words:
+        with open(args.words, encoding="utf-8") as f:
+            words = [line.strip().lower() for line in f if line.strip()]
+    else:
+        words = game_words()
+    clues = {} if args.refresh or not os.path.exists(args.out) else load_clue_pack(args.out)
+    todo = [w for w in dict.fromkeys(words) if w not in clues]
+    print(f"[CluePack] {len(words) - len(todo)} of {len(words)} words already in {args.out}")
+
+    t0 = time.perf_counter()
+    new_clues, rejected, requests = compile_clues(OpenAI(api_key=api_key), todo, model,
+                                                  args.batch_size, args.workers, args.rounds)
+    clues.update(new_clues)
+    save_clue_pack(args.out, clues, model)
+    print(f"[CluePack] {len(new_clues)} words compiled with {requests} requests in {time.perf_counter() - t0:.1f}s "
+          f"(one request per word would be {len(todo)}); {len(clues)} words in {args.out}")
+    if rejected:
+        print(f"[CluePack] No valid clues for: {', '.join(rejected)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+LOOKAHEAD = 4  # how many upcoming deck words to resolve ahead of time
+
+
+class CluePrefetcher:
+    """
+    Resolves clues for upcoming words on worker threads so the game loop never waits on the API.
+
+    - prefetch(deck) starts lookups for the next LOOKAHEAD words (the deck pops from the end)
+      and drops lookups for any other word except the current one
+    - take(word) returns the clues if ready, otherwise the fallback clues right away
+    - ready(word) lets the loop swap in the real clues once they arrive
+    """
+
+    def __init__(self, resolve, fallback, lookahead: int = LOOKAHEAD, workers: int = 3):
+        self.resolve = resolve
+        self.fallback = fallback
+        self.lookahead = lookahead
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clue-prefetch")
+        self._futures = {}
+        self._current = None
+
+    def prefetch(self, deck) -> None:
+        upcoming = list(deck[-self.lookahead:])
+        # Words that ended before their lookup finished, or left the window: a later deal of
+        # the same word should look it up again rather than get a result from long ago
+        for word in [w for w in self._futures if w != self._current and w not in upcoming]:
+            self._futures.pop(word).cancel()
+        for word in upcoming:
+            if word not in self._futures:
+                self._futures[word] = self._pool.submit(self.resolve, word)
+
+    def take(self, word):
+        """(clues, is_fallback). Never blocks."""
+        self._current = word
+        future = self._futures.get(word)
+        if future is None:
+            self._futures[word] = self._pool.submit(self.resolve, word)
+        elif future.done():
+            del self._futures[word]
+            return self._result(word, future), False
+        return self.fallback(word), True
+
+    def ready(self, word):
+        """Clues for `word` if its lookup has finished since take(), else None."""
+        future = self._futures.get(word)
+        if future is None or not future.done():
+            return None
+        del self._futures[word]
+        return self._result(word, future)
+
+    def reset(self) -> None:
+        """Forget lookups for the old deck (e.g. on restart). Running ones finish in the background."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._current = None
+
+    def shutdown(self) -> None:
+        self.reset()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _result(self, word, future):
+        try:
+            return future.result()
+        except Exception as ex:
+            print(f"[Prefetch] Clue lookup failed for '{word}': {ex}")
+            return self.fallback(word)
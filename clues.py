@@ -0,0 +1,53 @@
+"""
+The AI clue request shared by the IntelliSpell games and the clue tools.
+Bump CLUE_PROMPT_VERSION whenever the prompt or parsing changes so cached clues are refreshed.
+"""
+import threading
+
+CLUE_PROMPT_VERSION = 1
+
+def clue_prompt(word):
+    return (
+        f"Give THREE progressive hints for kids to guess the word '{word}'. "
+        "Each hint should be more helpful than the previous one. "
+        "Do NOT reveal the word in any hint. Keep each hint short.\n"
+        "Format: Hint 1: [first hint]\nHint 2: [second hint]\nHint 3: [third hint]"
+    )
+
+def parse_hints(response):
+    """'Hint 1: ...' lines -> list of clue strings."""
+    clues = []
+    for line in response.strip().split('\n'):
+        if line.startswith('Hint'):
+            clue = line.split(': ', 1)[1] if ': ' in line else line
+            clues.append(clue.strip())
+    return clues
+
+def request_ai_clues(client, word, model):
+    """Ask the model for three clues. Returns the list, or None if the reply wasn't three hints."""
+    r = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": clue_prompt(word)}],
+        temperature=0.7
+    )
+    clues = parse_hints(r.choices[0].message.content)
+    return clues if len(clues) == 3 else None
+
+class LazyOpenAI:
+    """
+    Stands in for OpenAI(**kwargs): the SDK (about half a second of imports) is loaded and the
+    client built on first use, from whichever clue thread gets there first, not at game start.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._client = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    self._client = OpenAI(**self._kwargs)
+        return getattr(self._client, name)
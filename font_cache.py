@@ -0,0 +1,54 @@
+"""
+System fonts resolved once and remembered between launches.
+
+pygame.font.SysFont scans every installed font the first time it is called in a process (the
+registry on Windows, fc-list on Linux). sys_font() asks SysFont which file it would open,
+keeps the answer in font_cache.json (FONT_CACHE_FILE), and on later launches opens that file
+directly, so the scan only happens on the first launch or after the font file goes away.
+"""
+import json
+import os
+
+import pygame
+
+FONT_CACHE_FILE = os.getenv("FONT_CACHE_FILE", "font_cache.json")
+
+_resolved = None  # {"name|bold|italic": [path or None, fake bold, fake italic]}
+
+
+def _load() -> dict:
+    try:
+        with open(FONT_CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(resolved: dict) -> None:
+    tmp = FONT_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(resolved, f, indent=1)
+        os.replace(tmp, FONT_CACHE_FILE)
+    except OSError as e:
+        print(f"[Fonts] Could not save {FONT_CACHE_FILE}: {e}")
+
+
+def sys_font(name: str, size: int, bold: bool = False, italic: bool = False) -> pygame.font.Font:
+    """Same font as pygame.font.SysFont(name, size, bold, italic), without the font scan once cached."""
+    global _resolved
+    if _resolved is None:
+        _resolved = _load()
+
+    key = f"{name}|{bold:d}|{italic:d}"
+    entry = _resolved.get(key)
+    if entry is None or (entry[0] is not None and not os.path.exists(entry[0])):
+        entry = pygame.font.SysFont(name, size, bold, italic, constructor=lambda path, _, b, i: [path, b, i])
+        _resolved[key] = entry
+        _save(_resolved)
+
+    path, fake_bold, fake_italic = entry
+    font = pygame.font.Font(path, size)
+    font.set_bold(fake_bold)
+    font.set_italic(fake_italic)
+    return font
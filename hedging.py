@@ -0,0 +1,120 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from speculation import fetch_persona_text
+
+
+class HedgePolicy:
+    """
+    When to send a backup request to a faster model, and who won.
+    The hedge starts once the primary has run longer than the `percentile` of recent
+    primary latencies (never later than `deadline_s`; just `deadline_s` until there is enough history).
+    """
+
+    def __init__(self, hedge_model: str, deadline_s: float = 12.0, percentile: float = 90, min_samples: int = 20):
+        self.hedge_model = hedge_model
+        self.deadline_s = deadline_s
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.hedges_started = 0
+        self.hedges_skipped = 0
+        self.wins = {"primary": 0, "hedge": 0}
+        self._primary_latencies = deque(maxlen=200)
+        self._lock = threading.Lock()
+
+    def hedge_after(self) -> float:
+        with self._lock:
+            samples = sorted(self._primary_latencies)
+        if len(samples) < self.min_samples:
+            return self.deadline_s
+        idx = max(0, math.ceil(self.percentile / 100 * len(samples)) - 1)
+        return min(self.deadline_s, samples[idx])
+
+    def record(self, **event) -> None:
+        with self._lock:
+            if "primary_latency" in event:
+                self._primary_latencies.append(event["primary_latency"])
+            if event.get("hedge_started"):
+                self.hedges_started += 1
+            if event.get("hedge_skipped"):
+                self.hedges_skipped += 1
+            if "winner" in event:
+                self.wins[event["winner"]] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"hedges_started": self.hedges_started, "hedges_skipped": self.hedges_skipped, **{f"{k}_wins": v for k, v in self.wins.items()}}
+        stats["hedge_after_s"] = round(self.hedge_after(), 2)
+        return stats
+
+
+def hedged_persona_text(pool, client, prompt: str, primary_model: str, policy: HedgePolicy, is_valid,
+                        admission=None, on_usage=None):
+    """
+    Run the primary request; if it hasn't answered after policy.hedge_after(), also ask the
+    hedge model. The first reply that passes `is_valid(text)` wins and the other request is
+    cancelled. Returns (output_text, tier) with tier "primary" or "hedge". If no reply is valid,
+    the first non-empty one is returned so the caller can still repair it.
+    The caller holds an admission slot for the primary; the hedge needs its own from
+    `admission.try_acquire()` and is skipped when none is free, so hedging never adds load
+    beyond what the controller admits. `on_usage(usage)` gets the token usage of every
+    response that completed, including a losing tier that finished anyway.
+    """
+    cancels = {"primary": threading.Event(), "hedge": threading.Event()}
+    t0 = time.perf_counter()
+    primary = pool.submit(fetch_persona_text, client, prompt, cancels["primary"], primary_model, on_usage)
+    tiers = {primary: "primary"}
+    hedge_after = policy.hedge_after()
+    done, _ = wait([primary], timeout=hedge_after)
+    if not done and admission is not None and not admission.try_acquire():
+        print("[Hedge] No admission slot free, not hedging")
+        policy.record(hedge_skipped=True)
+    elif not done:
+        policy.record(hedge_started=True)
+        hedge = pool.submit(_admitted, admission, fetch_persona_text, client, prompt, cancels["hedge"],
+                            policy.hedge_model, on_usage)
+        tiers[hedge] = "hedge"
+
+    fallback, first_error = None, None
+    pending = set(tiers)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            tier = tiers[fut]
+            try:
+                text = fut.result()
+            except Exception as ex:
+                print(f"[Hedge] {tier} request failed: {ex}")
+                first_error = first_error or ex
+                continue
+            if tier == "primary":
+                policy.record(primary_latency=time.perf_counter() - t0)
+            if text and is_valid(text):
+                if tier == "hedge" and primary in pending:
+                    # The cancelled primary would have taken at least this long; leaving it out
+                    # would teach the percentile that primaries are faster than they are
+                    policy.record(primary_latency=max(time.perf_counter() - t0, hedge_after))
+                for other, event in cancels.items():
+                    if other != tier:
+                        event.set()
+                policy.record(winner=tier)
+                print(f"[Hedge] {tier} won after {time.perf_counter() - t0:.1f}s")
+                return text, tier
+            fallback = fallback or (text, tier)
+
+    if fallback and fallback[0]:
+        policy.record(winner=fallback[1])
+        return fallback
+    raise first_error or RuntimeError("No tier returned a persona")
+
+
+def _admitted(admission, fn, *args):
+    """Run fn(*args), then give back the admission slot taken for it (if any)."""
+    try:
+        return fn(*args)
+    finally:
+        if admission is not None:
+            admission.release()
@@ -0,0 +1,36 @@
+import pygame
+
+IDLE_AFTER_MS = 1500    # no input for this long and nothing pending -> go idle
+IDLE_TIMEOUT_MS = 1000  # longest a single idle wait blocks
+
+
+class IdleClock:
+    """
+    Frame pacing for the game loops. While something is happening (a timer or clue lookup is
+    pending, or input arrived in the last IDLE_AFTER_MS) it behaves like clock.tick(FPS) plus
+    pygame.event.get(). Otherwise it blocks in pygame.event.wait() until input arrives, waking
+    at most every IDLE_TIMEOUT_MS, so a screen nobody is using costs almost no CPU.
+    """
+
+    def __init__(self, fps: int, idle_after_ms: int = IDLE_AFTER_MS, idle_timeout_ms: int = IDLE_TIMEOUT_MS):
+        self.fps = fps
+        self.idle_after_ms = idle_after_ms
+        self.idle_timeout_ms = idle_timeout_ms
+        self.clock = pygame.time.Clock()
+        self.last_input = pygame.time.get_ticks()
+        self.idle = False
+
+    def events(self, busy: bool = False) -> list:
+        """Wait for the next frame and return its events. Pass busy=True while anything time-based is pending."""
+        self.idle = not busy and pygame.time.get_ticks() - self.last_input >= self.idle_after_ms
+        if self.idle:
+            first = pygame.event.wait(self.idle_timeout_ms)
+            events = [first] if first.type != pygame.NOEVENT else []
+            events += pygame.event.get()
+            self.clock.tick()  # restart frame timing after the wait
+        else:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        if events:
+            self.last_input = pygame.time.get_ticks()
+        return events
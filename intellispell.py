@@ -1,8 +1,20 @@
 import pygame
-import random
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from clue_cache import ClueCache
+from clue_pack import DEFAULT_PACK, load_clue_pack
+from clue_prefetch import CluePrefetcher
+from clues import LazyOpenAI, request_ai_clues
+from font_cache import sys_font
+from idle_clock import IdleClock
+from render_layer import RenderLayer
+from session_log import Recorder
+from spell_engine import (
+    BACKSPACE, ENTER, GAME_OVER, NAME, PLAY, SHOW_ANSWER,
+    Rules, clues_arrived, deal, has_timer, mask_word, needs_word, new_game, press, tick,
+)
+from word_deck import build_deck, refill_deck
 
 load_dotenv()
 
@@ -30,229 +42,163 @@ WORDS = [
 # If deck finishes, generate new unique words automatically
 AUTO_GENERATE_WHEN_EMPTY = True
 GENERATED_WORDS_COUNT = 60  # how many new words to add when empty
+DIFFICULTY = None  # "easy" / "medium" / "hard": draw from word_index.bin instead of WORDS
+PREFER_CLUE_PACK = False  # True: words in the clue pack skip the API (for packs compiled with clue_pack.py)
+RECORD_SESSIONS = os.getenv("RECORD_SESSIONS") == "1"  # opt-in: log names, keys, words and clues to session_logs/
 # ----------------------------------------
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = LazyOpenAI(api_key=os.getenv("OPENAI_API_KEY"))  # the SDK is imported on the first AI clue
+CLUE_MODEL = "gpt-4o-mini"
+clue_cache = ClueCache.from_env()  # survives restarts; pre-warm with `python clue_cache.py warm --model gpt-4o-mini`
+CLUE_PACK = load_clue_pack(os.getenv("CLUE_PACK_FILE", DEFAULT_PACK))  # compile with `python clue_pack.py`
+
+def fallback_clues(word):
+    if word.lower() in CLUE_PACK:
+        return CLUE_PACK[word.lower()]
+    return [f"The word has {len(word)} letters."] * 3
 
 def ai_clues(word):
+    if PREFER_CLUE_PACK and word.lower() in CLUE_PACK:
+        return CLUE_PACK[word.lower()]
+
+    cached = clue_cache.get(word, CLUE_MODEL)
+    if cached:
+        return cached
+
     try:
-        r = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{
-                "role": "user",
-                "content": (
-                    f"Give THREE progressive hints for kids to guess the word '{word}'. "
-                    "Each hint should be more helpful than the previous one. "
-                    "Do NOT reveal the word in any hint. Keep each hint short.\n"
-                    "Format: Hint 1: [first hint]\nHint 2: [second hint]\nHint 3: [third hint]"
-                )
-            }],
-            temperature=0.7
-        )
-        response = r.choices[0].message.content.strip()
-        # Parse the response into a list
-        lines = response.split('\n')
-        clues = []
-        for line in lines:
-            if line.startswith('Hint'):
-                clue = line.split(': ', 1)[1] if ': ' in line else line
-                clues.append(clue.strip())
-        return clues if len(clues) == 3 else [f"The word has {len(word)} letters."] * 3
+        clues = request_ai_clues(client, word, CLUE_MODEL)
+        if not clues:
+            return fallback_clues(word)
+        clue_cache.put(word, CLUE_MODEL, clues)
+        return clues
     except Exception:
-        return [f"The word has {len(word)} letters."] * 3
-
-def mask_word(word, revealed_count=0):
-    result = []
-    for i, char in enumerate(word):
-        if i < revealed_count:
-            result.append(char)
-        else:
-            result.append("_")
-    return " ".join(result)
-
-
-
-def generate_word():
-    """Make a pronounceable-ish random word so the game stays unique."""
-    vowels = "aeiou"
-    consonants = "bcdfghjklmnpqrstvwxyz"
-    length = random.randint(5, 9)
-    w = []
-    start_consonant = random.choice([True, False])
-    for i in range(length):
-        use_consonant = (i % 2 == 0 and start_consonant) or (i % 2 == 1 and not start_consonant)
-        w.append(random.choice(consonants if use_consonant else vowels))
-    return "".join(w)
-
-def build_deck():
-    """Shuffle words into a 'deck' so no repeats within a game."""
-    deck = WORDS[:]
-    random.shuffle(deck)
-    return deck
-
-def refill_deck(deck):
-    """If deck is empty, optionally add new unique generated words."""
-    if not AUTO_GENERATE_WHEN_EMPTY:
-        return build_deck()
-
-    new_words = set()
-    while len(new_words) < GENERATED_WORDS_COUNT:
-        new_words.add(generate_word())
-
-    deck = list(new_words)
-    random.shuffle(deck)
-    return deck
+        return fallback_clues(word)
 
 pygame.init()
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption(TITLE)
-clock = pygame.time.Clock()
+clock = IdleClock(FPS)
 
-font_big = pygame.font.SysFont("Segoe UI", 36, bold=True)
-font_mid = pygame.font.SysFont("Segoe UI", 24)
-font_small = pygame.font.SysFont("Segoe UI", 18)
+font_big = sys_font("Segoe UI", 36, bold=True)  # font paths are cached in font_cache.json
+font_mid = sys_font("Segoe UI", 24)
+font_small = sys_font("Segoe UI", 18)
+
+# Text surfaces are cached and only the parts of the screen that changed are redrawn
+layer = RenderLayer(screen, (20, 24, 45))
+
+# Clues for upcoming words are fetched in the background so dealing a word never waits on the API
+prefetcher = CluePrefetcher(ai_clues, fallback_clues)
 
 # ---------------- GAME STATE ----------------
-phase = "NAME"  # NAME, PLAY, SHOW_ANSWER, GAME_OVER
-player_name = ""
-typed = ""
-
-deck = build_deck()     # unique words per run
-current_word = ""
-clues = []
-current_clue_index = 0
-lives = LIVES_PER_WORD
-failed_words = 0
-score = 0
-clue_text = ""
-show_answer_timer = 0
-revealed_count = 0
+# The state machine lives in spell_engine; this script is the pygame frontend for it
+rules = Rules(LIVES_PER_WORD, MAX_FAILED_WORDS)
+state = new_game(rules)
+recorder = Recorder.open(__file__, rules, RECORD_SESSIONS, difficulty=DIFFICULTY,
+                         auto_generate=AUTO_GENERATE_WHEN_EMPTY, generated_count=GENERATED_WORDS_COUNT)
+
+deck = build_deck(WORDS, DIFFICULTY, recorder.rng)  # unique words per run; seeded so replays deal the same words
+prefetcher.prefetch(deck)
 # -------------------------------------------
 
 def next_unique_word():
     """Pop next word from deck; refill if empty."""
     global deck
     if not deck:
-        deck = refill_deck(deck)
+        deck = refill_deck(WORDS, AUTO_GENERATE_WHEN_EMPTY, GENERATED_WORDS_COUNT, recorder.rng, DIFFICULTY)
     return deck.pop()
 
-def new_word():
-    global current_word, lives, clue_text, typed, clues, current_clue_index, revealed_count
-    current_word = next_unique_word()
-    lives = LIVES_PER_WORD
-    typed = ""
-    clues = ai_clues(current_word)
-    current_clue_index = 0
-    revealed_count = 0
-    clue_text = clues[0] if clues else "No clue available"
+def deal_next_word(state, now):
+    word = next_unique_word()
+    clues, is_fallback = prefetcher.take(word)
+    recorder.deal(word, clues, is_fallback, now)
+    prefetcher.prefetch(deck)
+    return deal(state, word, clues, is_fallback)
+
+def key_of(e):
+    if e.key == pygame.K_BACKSPACE:
+        return BACKSPACE
+    if e.key == pygame.K_RETURN:
+        return ENTER
+    return e.unicode
 
 running = True
-while running:
-    clock.tick(FPS)
-    now = pygame.time.get_ticks()
-
-    for e in pygame.event.get():
-        if e.type == pygame.QUIT:
-            running = False
-
-        if e.type == pygame.KEYDOWN:
-
-            if phase == "NAME":
-                if e.key == pygame.K_BACKSPACE:
-                    player_name = player_name[:-1]
-                elif e.key == pygame.K_RETURN and player_name.strip():
-                    phase = "PLAY"
-                    new_word()
-                elif e.unicode.isprintable():
-                    if len(player_name) < 18:
-                        player_name += e.unicode
-
-            elif phase == "PLAY":
-                if e.key == pygame.K_BACKSPACE:
-                    typed = typed[:-1]
-                elif e.key == pygame.K_RETURN:
-                    if typed.lower().strip() == current_word:
-                        score += 10
-                        new_word()
-                    else:
-                        lives -= 1
-                        revealed_count += 1
-                        current_clue_index += 1
-                        if current_clue_index < len(clues):
-                            clue_text = clues[current_clue_index]
-                        typed = ""
-
-                        if lives == 0:
-                            failed_words += 1
-                            phase = "SHOW_ANSWER"
-                            show_answer_timer = now + 2000
-                elif e.unicode.isalpha():
-                    typed += e.unicode.lower()
-
-            elif phase == "GAME_OVER":
-                if e.key == pygame.K_RETURN:
-                    # restart game
-                    phase = "NAME"
-                    player_name = ""
-                    typed = ""
-                    deck = build_deck()
-                    current_word = ""
-                    clues = []
-                    current_clue_index = 0
-                    lives = LIVES_PER_WORD
-                    failed_words = 0
-                    score = 0
-                    clue_text = ""
-                    revealed_count = 0
-
-    if phase == "SHOW_ANSWER" and now > show_answer_timer:
-        if failed_words >= MAX_FAILED_WORDS:
-            phase = "GAME_OVER"
-        else:
-            phase = "PLAY"
-            new_word()
-
-    # ---------------- DRAW ----------------
-    screen.fill((20, 24, 45))
-    screen.blit(font_small.render(f"{EVENT} | {SCHOOL}", True, (200, 200, 200)), (20, 15))
-    screen.blit(font_big.render(TITLE, True, (255, 255, 255)), (20, 45))
-
-    if player_name:
-        screen.blit(font_mid.render(f"Player: {player_name}", True, (180, 220, 255)), (20, 95))
-
-    screen.blit(
-        font_mid.render(f"Score: {score}   Failed: {failed_words}/{MAX_FAILED_WORDS}", True, (180, 255, 200)),
-        (20, 125)
-    )
-
-    if phase == "NAME":
-        screen.blit(font_mid.render("Enter  your name and press ENTER:", True, (255, 255, 180)), (20, 200))
-        screen.blit(font_mid.render(player_name, True, (255, 255, 255)), (20, 240))
-
-    elif phase == "PLAY":
-        screen.blit(font_mid.render("Guess the word:", True, (255, 255, 180)), (20, 190))
-        screen.blit(font_big.render(mask_word(current_word, revealed_count), True, (255, 255, 255)), (20, 230))
-
-        screen.blit(font_mid.render("AI Clue:", True, (200, 200, 255)), (20, 290))
-        # keep clue in one/two lines if long
-        clue = clue_text
-        if len(clue) > 55:
-            clue = clue[:55] + "..."
-        screen.blit(font_mid.render(clue, True, (255, 255, 255)), (20, 320))
-
-        screen.blit(font_mid.render(f"Lives left: {lives}", True, (255, 200, 200)), (20, 360))
-        screen.blit(font_mid.render("Your answer:", True, (200, 255, 200)), (20, 400))
-        screen.blit(font_mid.render(typed.upper(), True, (255, 255, 255)), (20, 430))
-
-    elif phase == "SHOW_ANSWER":
-        screen.blit(font_big.render("Right Answer:", True, (255, 180, 180)), (20, 240))
-        screen.blit(font_big.render(current_word.upper(), True, (255, 255, 255)), (20, 290))
-
-    elif phase == "GAME_OVER":
-        screen.blit(font_big.render("GAME OVER", True, (255, 100, 100)), (20, 230))
-        screen.blit(font_mid.render(f"Final Score: {score}", True, (255, 255, 255)), (20, 280))
-        screen.blit(font_mid.render("Press ENTER to restart", True, (200, 200, 200)), (20, 320))
-
-    pygame.display.flip()
-
-pygame.quit()
+try:
+    while running:
+        # Full frame rate while a timer or clue lookup is pending; otherwise sleep until input arrives
+        busy = has_timer(state) or (state.phase == PLAY and state.clues_are_fallback)
+        events = clock.events(busy)
+        now = pygame.time.get_ticks()
+
+        for e in events:
+            if e.type == pygame.QUIT:
+                running = False
+            elif e.type == pygame.WINDOWEXPOSED:
+                layer.invalidate()
+
+            if e.type == pygame.KEYDOWN:
+                restarting = state.phase == GAME_OVER
+                key = key_of(e)
+                recorder.key(key, now)
+                state = press(state, key, now)
+                if restarting and state.phase == NAME:
+                    deck = build_deck(WORDS, DIFFICULTY, recorder.rng)
+                    prefetcher.reset()
+                    prefetcher.prefetch(deck)
+                if needs_word(state):
+                    state = deal_next_word(state, now)
+
+        state = tick(state, now)
+        if needs_word(state):
+            state = deal_next_word(state, now)
+
+        # Swap in the AI clues if they arrived after the word started
+        if state.phase == PLAY and state.clues_are_fallback:
+            ready = prefetcher.ready(state.current_word)
+            if ready:
+                recorder.clues(ready, now)
+                state = clues_arrived(state, ready)
+        recorder.observe(state, now)
+
+        # ---------------- DRAW ----------------
+        layer.begin()
+        layer.text(font_small, f"{EVENT} | {SCHOOL}", (200, 200, 200), (20, 15))
+        layer.text(font_big, TITLE, (255, 255, 255), (20, 45))
+
+        if state.player_name:
+            layer.text(font_mid, f"Player: {state.player_name}", (180, 220, 255), (20, 95))
+
+        layer.text(font_mid, f"Score: {state.score}   Failed: {state.failed_words}/{MAX_FAILED_WORDS}", (180, 255, 200), (20, 125))
+
+        if state.phase == NAME:
+            layer.text(font_mid, "Enter  your name and press ENTER:", (255, 255, 180), (20, 200))
+            layer.text(font_mid, state.player_name, (255, 255, 255), (20, 240))
+
+        elif state.phase == PLAY:
+            layer.text(font_mid, "Guess the word:", (255, 255, 180), (20, 190))
+            layer.text(font_big, mask_word(state.current_word, state.revealed_count), (255, 255, 255), (20, 230))
+
+            layer.text(font_mid, "AI Clue:", (200, 200, 255), (20, 290))
+            # keep clue in one/two lines if long
+            clue = state.clue_text
+            if len(clue) > 55:
+                clue = clue[:55] + "..."
+            layer.text(font_mid, clue, (255, 255, 255), (20, 320))
+
+            layer.text(font_mid, f"Lives left: {state.lives}", (255, 200, 200), (20, 360))
+            layer.text(font_mid, "Your answer:", (200, 255, 200), (20, 400))
+            layer.text(font_mid, state.typed.upper(), (255, 255, 255), (20, 430))
+
+        elif state.phase == SHOW_ANSWER:
+            layer.text(font_big, "Right Answer:", (255, 180, 180), (20, 240))
+            layer.text(font_big, state.current_word.upper(), (255, 255, 255), (20, 290))
+
+        elif state.phase == GAME_OVER:
+            layer.text(font_big, "GAME OVER", (255, 100, 100), (20, 230))
+            layer.text(font_mid, f"Final Score: {state.score}", (255, 255, 255), (20, 280))
+            layer.text(font_mid, "Press ENTER to restart", (200, 200, 200), (20, 320))
+
+        layer.present()
+finally:
+    recorder.close()
+    prefetcher.shutdown()
+    pygame.quit()
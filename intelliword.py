@@ -1,8 +1,20 @@
 import pygame
-import random
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from clue_cache import ClueCache
+from clue_pack import DEFAULT_PACK, load_clue_pack
+from clue_prefetch import CluePrefetcher
+from clues import LazyOpenAI, request_ai_clues
+from font_cache import sys_font
+from idle_clock import IdleClock
+from render_layer import RenderLayer
+from session_log import Recorder
+from spell_engine import (
+    BACKSPACE, ENTER, GAME_OVER, NAME, PLAY, SHOW_ANSWER,
+    Rules, clues_arrived, deal, has_timer, mask_word, needs_word, new_game, press, tick,
+)
+from word_deck import build_deck, refill_deck
 
 load_dotenv()
 
@@ -30,58 +42,23 @@ WORDS = [
 # If deck finishes, generate new unique words automatically
 AUTO_GENERATE_WHEN_EMPTY = True
 GENERATED_WORDS_COUNT = 60  # how many new words to add when empty
+DIFFICULTY = None  # "easy" / "medium" / "hard": draw from word_index.bin instead of WORDS
 USE_OPENAI_CLUES = True
+PREFER_CLUE_PACK = False  # True: words in the clue pack skip the API (for packs compiled with clue_pack.py)
+RECORD_SESSIONS = os.getenv("RECORD_SESSIONS") == "1"  # opt-in: log names, keys, words and clues to session_logs/
 # ----------------------------------------
 
 OPENAI_API_KEY = (os.getenv("OPENAI_API_KEY") or "").strip().strip('"').strip("'")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1")
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
-
-STATIC_CLUE_BANK = {
-    "school": ["A place where students learn.", "It has classrooms and teachers.", "You go here for education."],
-    "pencil": ["You use this for writing.", "It is made of wood and graphite.", "You sharpen it when the tip is dull."],
-    "teacher": ["This person helps students learn.", "They explain lessons in class.", "Students ask this person questions."],
-    "planet": ["It moves around a star.", "Earth is one of these.", "It is a large object in space."],
-    "forest": ["A large area filled with trees.", "Many animals live here.", "It is bigger than a garden or park."],
-    "garden": ["A place where plants are grown.", "You may find flowers and vegetables here.", "It can be in front of a house."],
-    "friend": ["Someone you like and trust.", "You enjoy spending time together.", "A close companion."],
-    "python": ["A popular programming language.", "It is also the name of a snake.", "People use it to write code."],
-    "robot": ["A machine that can do tasks.", "It may move and follow instructions.", "Used in factories and science labs."],
-    "future": ["The time that has not happened yet.", "It comes after today and tomorrow.", "People plan for this time."],
-    "science": ["This subject asks how things work.", "It includes experiments and observations.", "You learn this in a lab and classroom."],
-    "energy": ["This is needed to do work or move.", "Food gives your body this.", "Electricity is a common form of this."],
-    "library": ["A quiet place with many books.", "People read and study here.", "You can borrow books from this place."],
-    "picture": ["This shows an image of something.", "It can be drawn or taken with a camera.", "Another word is a photo or drawing."],
-    "student": ["A person who learns in school.", "This person attends classes.", "Teachers teach this person."],
-    "computer": ["An electronic machine for work and play.", "It has a screen and keyboard.", "You can code and browse on this device."],
-    "keyboard": ["An input device with many keys.", "You press letters and numbers on it.", "You use it to type on a computer."],
-    "battery": ["This stores power.", "Phones and toys often need this.", "It provides electricity to devices."],
-    "language": ["A system of words and grammar.", "People use it to communicate.", "English, Tamil, and Hindi are examples."],
-    "festival": ["A special celebration event.", "People gather with joy and traditions.", "It may include music, food, and decorations."],
-    "history": ["This is about past events.", "You learn about old people and places.", "It explains what happened long ago."],
-    "morning": ["A part of the day.", "It comes after night.", "It is the time before noon."],
-    "evening": ["A part of the day near sunset.", "It comes after afternoon.", "People often relax during this time."],
-    "reading": ["An activity with books or text.", "You use your eyes to understand words.", "You do this with stories and lessons."],
-    "writing": ["You create words and sentences.", "You can do this with a pen or keyboard.", "It is the opposite skill of reading."],
-    "respect": ["A value shown in good behavior.", "You show it by being polite and kind.", "You should give this to elders and others."],
-    "courage": ["This means being brave.", "You show it when facing fear.", "Heroes often have this quality."],
-    "holiday": ["A day without regular school or work.", "People rest, travel, or celebrate.", "It is a special break day."],
-    "practice": ["Doing something again and again.", "It helps you improve a skill.", "You need this to get better."],
-    "creative": ["This describes new and original ideas.", "Artists and inventors often are this.", "It means using imagination."],
-    "learning": ["The process of gaining knowledge.", "This happens at school and at home.", "Reading and listening help with this."],
-    "technology": ["Tools and machines made by humans.", "It includes computers and the internet.", "Modern life uses this every day."],
-    "curiosity": ["A strong desire to know more.", "It makes you ask questions.", "Scientists and children often show this."],
-    "imagination": ["The ability to form ideas in your mind.", "You use it while creating stories.", "It helps you think beyond what you see."],
-    "celebrate": ["To mark a happy event.", "People do this at birthdays and festivals.", "It often includes joy, food, and fun."],
-    "together": ["This means with one another.", "Friends or family can do things this way.", "It is the opposite of alone."],
-    "solution": ["An answer to a problem.", "You find this after thinking carefully.", "Math questions often have this."],
-    "problem": ["A difficulty that needs solving.", "It can be in math or daily life.", "You look for a solution to this."],
-}
+client = LazyOpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None  # the SDK is imported on the first AI clue
+clue_cache = ClueCache.from_env()  # survives restarts; pre-warm with `python clue_cache.py warm`
+
+CLUE_PACK = load_clue_pack(os.getenv("CLUE_PACK_FILE", DEFAULT_PACK))  # compile with `python clue_pack.py`
 
 def static_clues(word):
     lower_word = word.lower()
-    if lower_word in STATIC_CLUE_BANK:
-        return STATIC_CLUE_BANK[lower_word]
+    if lower_word in CLUE_PACK:
+        return CLUE_PACK[lower_word]
 
     letters = len(lower_word)
     vowels = sum(1 for ch in lower_word if ch in "aeiou")
@@ -92,232 +69,152 @@ def static_clues(word):
     ]
 
 def ai_clues(word):
-    if not USE_OPENAI_CLUES:
+    if not USE_OPENAI_CLUES or (PREFER_CLUE_PACK and word.lower() in CLUE_PACK):
         return static_clues(word)
 
+    cached = clue_cache.get(word, OPENAI_MODEL)
+    if cached:
+        return cached
+
     if not client:
         print("[OpenAI] Missing OPENAI_API_KEY in environment/.env")
         return static_clues(word)
 
     try:
-        r = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[{
-                "role": "user",
-                "content": (
-                    f"Give THREE progressive hints for kids to guess the word '{word}'. "
-                    "Each hint should be more helpful than the previous one. "
-                    "Do NOT reveal the word in any hint. Keep each hint short.\n"
-                    "Format: Hint 1: [first hint]\nHint 2: [second hint]\nHint 3: [third hint]"
-                )
-            }],
-            temperature=0.7
-        )
-        response = r.choices[0].message.content.strip()
-        # Parse the response into a list
-        lines = response.split('\n')
-        clues = []
-        for line in lines:
-            if line.startswith('Hint'):
-                clue = line.split(': ', 1)[1] if ': ' in line else line
-                clues.append(clue.strip())
-        return clues if len(clues) == 3 else static_clues(word)
+        clues = request_ai_clues(client, word, OPENAI_MODEL)
+        if not clues:
+            return static_clues(word)
+        clue_cache.put(word, OPENAI_MODEL, clues)
+        return clues
     except Exception as ex:
         print(f"[OpenAI] Clue generation failed for '{word}' with model '{OPENAI_MODEL}': {ex}")
         return static_clues(word)
 
-def mask_word(word, revealed_count=0):
-    result = []
-    for i, char in enumerate(word):
-        if i < revealed_count:
-            result.append(char)
-        else:
-            result.append("_")
-    return " ".join(result)
-
-
-
-def generate_word():
-    """Make a pronounceable-ish random word so the game stays unique."""
-    vowels = "aeiou"
-    consonants = "bcdfghjklmnpqrstvwxyz"
-    length = random.randint(5, 9)
-    w = []
-    start_consonant = random.choice([True, False])
-    for i in range(length):
-        use_consonant = (i % 2 == 0 and start_consonant) or (i % 2 == 1 and not start_consonant)
-        w.append(random.choice(consonants if use_consonant else vowels))
-    return "".join(w)
-
-def build_deck():
-    """Shuffle words into a 'deck' so no repeats within a game."""
-    deck = WORDS[:]
-    random.shuffle(deck)
-    return deck
-
-def refill_deck(deck):
-    """If deck is empty, optionally add new unique generated words."""
-    if not AUTO_GENERATE_WHEN_EMPTY:
-        return build_deck()
-
-    new_words = set()
-    while len(new_words) < GENERATED_WORDS_COUNT:
-        new_words.add(generate_word())
-
-    deck = list(new_words)
-    random.shuffle(deck)
-    return deck
-
 pygame.init()
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption(TITLE)
-clock = pygame.time.Clock()
+clock = IdleClock(FPS)
 
-font_big = pygame.font.SysFont("Segoe UI", 36, bold=True)
-font_mid = pygame.font.SysFont("Segoe UI", 24)
-font_small = pygame.font.SysFont("Segoe UI", 18)
+font_big = sys_font("Segoe UI", 36, bold=True)  # font paths are cached in font_cache.json
+font_mid = sys_font("Segoe UI", 24)
+font_small = sys_font("Segoe UI", 18)
+
+# Text surfaces are cached and only the parts of the screen that changed are redrawn
+layer = RenderLayer(screen, (20, 24, 45))
+
+# Clues for upcoming words are fetched in the background so dealing a word never waits on the API
+prefetcher = CluePrefetcher(ai_clues, static_clues)
 
 # ---------------- GAME STATE ----------------
-phase = "NAME"  # NAME, PLAY, SHOW_ANSWER, GAME_OVER
-player_name = ""
-typed = ""
-
-deck = build_deck()     # unique words per run
-current_word = ""
-clues = []
-current_clue_index = 0
-lives = LIVES_PER_WORD
-failed_words = 0
-score = 0
-clue_text = ""
-show_answer_timer = 0
-revealed_count = 0
+# The state machine lives in spell_engine; this script is the pygame frontend for it
+rules = Rules(LIVES_PER_WORD, MAX_FAILED_WORDS)
+state = new_game(rules)
+recorder = Recorder.open(__file__, rules, RECORD_SESSIONS, difficulty=DIFFICULTY,
+                         auto_generate=AUTO_GENERATE_WHEN_EMPTY, generated_count=GENERATED_WORDS_COUNT)
+
+deck = build_deck(WORDS, DIFFICULTY, recorder.rng)  # unique words per run; seeded so replays deal the same words
+prefetcher.prefetch(deck)
 # -------------------------------------------
 
 def next_unique_word():
     """Pop next word from deck; refill if empty."""
     global deck
     if not deck:
-        deck = refill_deck(deck)
+        deck = refill_deck(WORDS, AUTO_GENERATE_WHEN_EMPTY, GENERATED_WORDS_COUNT, recorder.rng, DIFFICULTY)
     return deck.pop()
 
-def new_word():
-    global current_word, lives, clue_text, typed, clues, current_clue_index, revealed_count
-    current_word = next_unique_word()
-    lives = LIVES_PER_WORD
-    typed = ""
-    clues = ai_clues(current_word)
-    current_clue_index = 0
-    revealed_count = 0
-    clue_text = clues[0] if clues else "No clue available"
+def deal_next_word(state, now):
+    word = next_unique_word()
+    clues, is_fallback = prefetcher.take(word)
+    recorder.deal(word, clues, is_fallback, now)
+    prefetcher.prefetch(deck)
+    return deal(state, word, clues, is_fallback)
+
+def key_of(e):
+    if e.key == pygame.K_BACKSPACE:
+        return BACKSPACE
+    if e.key == pygame.K_RETURN:
+        return ENTER
+    return e.unicode
 
 running = True
-while running:
-    clock.tick(FPS)
-    now = pygame.time.get_ticks()
-
-    for e in pygame.event.get():
-        if e.type == pygame.QUIT:
-            running = False
-
-        if e.type == pygame.KEYDOWN:
-
-            if phase == "NAME":
-                if e.key == pygame.K_BACKSPACE:
-                    player_name = player_name[:-1]
-                elif e.key == pygame.K_RETURN and player_name.strip():
-                    phase = "PLAY"
-                    new_word()
-                elif e.unicode.isprintable():
-                    if len(player_name) < 18:
-                        player_name += e.unicode
-
-            elif phase == "PLAY":
-                if e.key == pygame.K_BACKSPACE:
-                    typed = typed[:-1]
-                elif e.key == pygame.K_RETURN:
-                    if typed.lower().strip() == current_word:
-                        score += 10
-                        new_word()
-                    else:
-                        lives -= 1
-                        revealed_count += 1
-                        current_clue_index += 1
-                        if current_clue_index < len(clues):
-                            clue_text = clues[current_clue_index]
-                        typed = ""
-
-                        if lives == 0:
-                            failed_words += 1
-                            phase = "SHOW_ANSWER"
-                            show_answer_timer = now + 2000
-                elif e.unicode.isalpha():
-                    typed += e.unicode.lower()
-
-            elif phase == "GAME_OVER":
-                if e.key == pygame.K_RETURN:
-                    # restart game
-                    phase = "NAME"
-                    player_name = ""
-                    typed = ""
-                    deck = build_deck()
-                    current_word = ""
-                    clues = []
-                    current_clue_index = 0
-                    lives = LIVES_PER_WORD
-                    failed_words = 0
-                    score = 0
-                    clue_text = ""
-                    revealed_count = 0
-
-    if phase == "SHOW_ANSWER" and now > show_answer_timer:
-        if failed_words >= MAX_FAILED_WORDS:
-            phase = "GAME_OVER"
-        else:
-            phase = "PLAY"
-            new_word()
-
-    # ---------------- DRAW ----------------
-    screen.fill((20, 24, 45))
-    screen.blit(font_small.render(f"{EVENT} | {SCHOOL}", True, (200, 200, 200)), (20, 15))
-    screen.blit(font_big.render(TITLE, True, (255, 255, 255)), (20, 45))
-
-    if player_name:
-        screen.blit(font_mid.render(f"Player: {player_name}", True, (180, 220, 255)), (20, 95))
-
-    screen.blit(
-        font_mid.render(f"Score: {score}   Failed: {failed_words}/{MAX_FAILED_WORDS}", True, (180, 255, 200)),
-        (20, 125)
-    )
-
-    if phase == "NAME":
-        screen.blit(font_mid.render("Enter  your name and press ENTER:", True, (255, 255, 180)), (20, 200))
-        screen.blit(font_mid.render(player_name, True, (255, 255, 255)), (20, 240))
-
-    elif phase == "PLAY":
-        screen.blit(font_mid.render("Guess the word:", True, (255, 255, 180)), (20, 190))
-        screen.blit(font_big.render(mask_word(current_word, revealed_count), True, (255, 255, 255)), (20, 230))
-
-        screen.blit(font_mid.render("AI Clue:", True, (200, 200, 255)), (20, 290))
-        # keep clue in one/two lines if long
-        clue = clue_text
-        if len(clue) > 55:
-            clue = clue[:55] + "..."
-        screen.blit(font_mid.render(clue, True, (255, 255, 255)), (20, 320))
-
-        screen.blit(font_mid.render(f"Lives left: {lives}", True, (255, 200, 200)), (20, 360))
-        screen.blit(font_mid.render("Your answer:", True, (200, 255, 200)), (20, 400))
-        screen.blit(font_mid.render(typed.upper(), True, (255, 255, 255)), (20, 430))
-
-    elif phase == "SHOW_ANSWER":
-        screen.blit(font_big.render("Right Answer:", True, (255, 180, 180)), (20, 240))
-        screen.blit(font_big.render(current_word.upper(), True, (255, 255, 255)), (20, 290))
-
-    elif phase == "GAME_OVER":
-        screen.blit(font_big.render("GAME OVER", True, (255, 100, 100)), (20, 230))
-        screen.blit(font_mid.render(f"Final Score: {score}", True, (255, 255, 255)), (20, 280))
-        screen.blit(font_mid.render("Press ENTER to restart", True, (200, 200, 200)), (20, 320))
-
-    pygame.display.flip()
-
-pygame.quit()
+try:
+    while running:
+        # Full frame rate while a timer or clue lookup is pending; otherwise sleep until input arrives
+        busy = has_timer(state) or (state.phase == PLAY and state.clues_are_fallback)
+        events = clock.events(busy)
+        now = pygame.time.get_ticks()
+
+        for e in events:
+            if e.type == pygame.QUIT:
+                running = False
+            elif e.type == pygame.WINDOWEXPOSED:
+                layer.invalidate()
+
+            if e.type == pygame.KEYDOWN:
+                restarting = state.phase == GAME_OVER
+                key = key_of(e)
+                recorder.key(key, now)
+                state = press(state, key, now)
+                if restarting and state.phase == NAME:
+                    deck = build_deck(WORDS, DIFFICULTY, recorder.rng)
+                    prefetcher.reset()
+                    prefetcher.prefetch(deck)
+                if needs_word(state):
+                    state = deal_next_word(state, now)
+
+        state = tick(state, now)
+        if needs_word(state):
+            state = deal_next_word(state, now)
+
+        # Swap in the AI clues if they arrived after the word started
+        if state.phase == PLAY and state.clues_are_fallback:
+            ready = prefetcher.ready(state.current_word)
+            if ready:
+                recorder.clues(ready, now)
+                state = clues_arrived(state, ready)
+        recorder.observe(state, now)
+
+        # ---------------- DRAW ----------------
+        layer.begin()
+        layer.text(font_small, f"{EVENT} | {SCHOOL}", (200, 200, 200), (20, 15))
+        layer.text(font_big, TITLE, (255, 255, 255), (20, 45))
+
+        if state.player_name:
+            layer.text(font_mid, f"Player: {state.player_name}", (180, 220, 255), (20, 95))
+
+        layer.text(font_mid, f"Score: {state.score}   Failed: {state.failed_words}/{MAX_FAILED_WORDS}", (180, 255, 200), (20, 125))
+
+        if state.phase == NAME:
+            layer.text(font_mid, "Enter  your name and press ENTER:", (255, 255, 180), (20, 200))
+            layer.text(font_mid, state.player_name, (255, 255, 255), (20, 240))
+
+        elif state.phase == PLAY:
+            layer.text(font_mid, "Guess the word:", (255, 255, 180), (20, 190))
+            layer.text(font_big, mask_word(state.current_word, state.revealed_count), (255, 255, 255), (20, 230))
+
+            layer.text(font_mid, "AI Clue:", (200, 200, 255), (20, 290))
+            # keep clue in one/two lines if long
+            clue = state.clue_text
+            if len(clue) > 55:
+                clue = clue[:55] + "..."
+            layer.text(font_mid, clue, (255, 255, 255), (20, 320))
+
+            layer.text(font_mid, f"Lives left: {state.lives}", (255, 200, 200), (20, 360))
+            layer.text(font_mid, "Your answer:", (200, 255, 200), (20, 400))
+            layer.text(font_mid, state.typed.upper(), (255, 255, 255), (20, 430))
+
+        elif state.phase == SHOW_ANSWER:
+            layer.text(font_big, "Right Answer:", (255, 180, 180), (20, 240))
+            layer.text(font_big, state.current_word.upper(), (255, 255, 255), (20, 290))
+
+        elif state.phase == GAME_OVER:
+            layer.text(font_big, "GAME OVER", (255, 100, 100), (20, 230))
+            layer.text(font_mid, f"Final Score: {state.score}", (255, 255, 255), (20, 280))
+            layer.text(font_mid, "Press ENTER to restart", (200, 200, 200), (20, 320))
+
+        layer.present()
+finally:
+    recorder.close()
+    prefetcher.shutdown()
+    pygame.quit()
@@ -0,0 +1,67 @@
+import json
+
+
+class JsonFieldStream:
+    """
+    Incremental parser for a single JSON object arriving in chunks.
+    feed() returns the top-level (key, value) pairs that finished in that chunk,
+    so the UI can show each field as soon as it is complete.
+    Text before the first '{' (e.g. "Sure! Here you go:") is skipped.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.done = False
+        self._pos = 0            # next char to scan
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = -1  # start of the current top-level "key": value
+
+    def feed(self, chunk: str) -> list:
+        if self.done:
+            return []
+        self.buffer += chunk
+        fields = []
+        buf = self.buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._member_start = i + 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    fields.extend(self._parse_member(buf[self._member_start:i]))
+                    self.done = True
+                    i += 1
+                    break
+            elif ch == "," and self._depth == 1:
+                fields.extend(self._parse_member(buf[self._member_start:i]))
+                self._member_start = i + 1
+            i += 1
+        self._pos = i
+        return fields
+
+    @staticmethod
+    def _parse_member(text: str) -> list:
+        if not text.strip():
+            return []
+        try:
+            return list(json.loads("{" + text + "}").items())
+        except ValueError:
+            # Leave broken fields to the full parse at the end
+            return []
@@ -0,0 +1,267 @@
+"""
+Offline stand-in for the OpenAI Responses and Chat Completions endpoints.
+
+    python mock_openai.py --port 8765 --latency lognormal:2000 --error-rate 0.02 --malformed-rate 0.1
+
+Point the apps at it through the base-URL setting the OpenAI SDK already reads:
+
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python Intellispell_v2.py
+
+Persona requests get a plausible card built from the prompt (only the requested keys when
+a json_schema text format is sent, like the repair calls). Clue requests get three hints,
+or a structured clue pack for batched clue_pack.py requests.
+Latency, 429s, 5xx errors and malformed JSON can be injected to rehearse an event offline.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# -----------------------------
+# Behaviour knobs
+# -----------------------------
+class MockConfig:
+    def __init__(self, latency: str = "fixed:300", error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 malformed_rate: float = 0.0, stream_chunk: int = 12, seed: int | None = None):
+        self.latency_kind, self.latency_ms = parse_latency(latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.stream_chunk = stream_chunk
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def roll(self) -> float:
+        with self._lock:
+            self.requests += 1
+            return self.rng.random()
+
+    def latency_seconds(self) -> float:
+        """One latency sample; `latency_ms` is the median for every distribution."""
+        with self._lock:
+            ms = self.latency_ms
+            if self.latency_kind == "uniform":
+                ms = self.rng.uniform(0, 2 * ms)
+            elif self.latency_kind == "exp":
+                ms = self.rng.expovariate(math.log(2) / ms) if ms else 0
+            elif self.latency_kind == "lognormal":
+                ms = self.rng.lognormvariate(math.log(ms), 0.5) if ms else 0
+        return ms / 1000
+
+def parse_latency(spec: str):
+    """'fixed:300', 'uniform:800', 'exp:1500', 'lognormal:2000' (median in ms)."""
+    kind, _, ms = spec.partition(":")
+    if kind not in ("fixed", "uniform", "exp", "lognormal"):
+        raise ValueError(f"Unknown latency distribution '{kind}'")
+    return kind, float(ms or 0)
+
+# -----------------------------
+# Fake content
+# -----------------------------
+CARD_KEYS = ["card_title", "name", "favorite", "persona_name", "tagline", "superpower",
+             "comfort_snack", "catchphrase", "why_it_matches", "predictions"]
+
+def fake_card(prompt: str, keys) -> dict:
+    name = (re.search(r"- Name: (.*)", prompt) or [None, "Friend"])[1].strip()
+    favorite = (re.search(r"- Childhood favorite: (.*)", prompt) or [None, "toys"])[1].strip()
+    card = {
+        "card_title": "Inner Child Cartoon Card",
+        "name": name,
+        "favorite": favorite,
+        "persona_name": f"Captain {favorite.title()}",
+        "tagline": f"Finds a little {favorite} magic in every day.",
+        "superpower": f"Turns any frown upside down with {favorite}.",
+        "comfort_snack": "Warm cookies",
+        "catchphrase": "Let's play!",
+        "why_it_matches": f"{name} and {favorite} go together like sunshine and smiles.",
+        "predictions": ["A surprise treat is coming.", "You will laugh loudly this week.", "A friend will share good news."],
+    }
+    return {k: card[k] for k in keys if k in card}
+
+def fake_clues(prompt: str) -> str:
+    word = (re.search(r"guess the word '([^']+)'", prompt) or [None, "word"])[1]
+    return (f"Hint 1: It has {len(word)} letters.\n"
+            f"Hint 2: It starts with '{word[0]}'.\n"
+            f"Hint 3: It ends with '{word[-1]}'.")
+
+def fake_clue_pack(prompt: str, rng, malformed_rate: float) -> str:
+    """Structured batch reply; with --malformed-rate some hints give the word away."""
+    entries = []
+    for word in re.findall(r"^- (.+)$", prompt, re.M):
+        hints = [f"It has {len(word)} letters.", f"It starts with '{word[0]}'.", f"It ends with '{word[-1]}'."]
+        if rng.random() < malformed_rate:
+            hints[2] = f"The answer is {word}."
+        entries.append({"word": word, "hints": hints})
+    return json.dumps({"clues": entries})
+
+def malform(text: str, rng) -> str:
+    """Break JSON the ways models do: cut off, chatty wrapper, or a trailing comma."""
+    choice = rng.randrange(3)
+    if choice == 0:
+        return text[: max(1, len(text) * 2 // 3)]
+    if choice == 1:
+        return f"Sure! Here is your card:\n{text[:-1]},}}\nHope you like it!"
+    return text.replace('"tagline"', '"tag line"')
+
+def usage(prompt: str, text: str) -> dict:
+    input_tokens, output_tokens = len(prompt) // 4, len(text) // 4
+    return {
+        "input_tokens": input_tokens, "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+        "input_tokens_details": {"cached_tokens": 0}, "output_tokens_details": {"reasoning_tokens": 0},
+    }
+
+def response_object(model: str, prompt: str, text: str) -> dict:
+    return {
+        "id": f"resp_mock_{random.getrandbits(32):08x}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": model,
+        "output": [{
+            "type": "message", "id": "msg_mock", "status": "completed", "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": usage(prompt, text),
+    }
+
+# -----------------------------
+# HTTP handler
+# -----------------------------
+class MockHandler(BaseHTTPRequestHandler):
+    config = MockConfig()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass  # keep load tests quiet
+
+    def do_POST(self):
+        length = int(self.headers.get("content-length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self.send_json(400, {"error": {"message": "invalid JSON body"}})
+
+        cfg = self.config
+        time.sleep(cfg.latency_seconds())
+        roll = cfg.roll()
+        if roll < cfg.rate_limit_rate:
+            return self.send_json(429, {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit"}},
+                                  {"retry-after": "1"})
+        if roll < cfg.rate_limit_rate + cfg.error_rate:
+            return self.send_json(500, {"error": {"message": "Internal error (mock)", "type": "server_error"}})
+        malformed = cfg.rng.random() < cfg.malformed_rate
+
+        path = self.path.rstrip("/")
+        if path.endswith("/responses"):
+            self.handle_responses(body, malformed)
+        elif path.endswith("/chat/completions"):
+            self.handle_chat(body)
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def handle_responses(self, body: dict, malformed: bool):
+        prompt = body.get("input") if isinstance(body.get("input"), str) else json.dumps(body.get("input"))
+        fmt = (body.get("text") or {}).get("format") or {}
+        keys = fmt.get("schema", {}).get("required") or CARD_KEYS
+        text = json.dumps(fake_card(prompt, keys), ensure_ascii=False)
+        if malformed:
+            text = malform(text, self.config.rng)
+        model = body.get("model", "gpt-5")
+        if not body.get("stream"):
+            return self.send_json(200, response_object(model, prompt, text))
+
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.send_header("connection", "close")
+        self.end_headers()
+        seq = 0
+        step = self.config.stream_chunk
+        per_chunk = self.config.latency_seconds() / max(1, len(text) // step) / 4  # streamed tail
+        for i in range(0, len(text), step):
+            seq += 1
+            self.send_event("response.output_text.delta", {
+                "delta": text[i:i+step], "item_id": "msg_mock", "output_index": 0, "content_index": 0,
+                "sequence_number": seq, "logprobs": [],
+            })
+            time.sleep(per_chunk)
+        self.send_event("response.completed", {"response": response_object(model, prompt, text),
+                                               "sequence_number": seq + 1})
+        self.close_connection = True
+
+    def handle_chat(self, body: dict):
+        prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+        if (body.get("response_format") or {}).get("type") == "json_schema":
+            text = fake_clue_pack(prompt, self.config.rng, self.config.malformed_rate)
+        else:
+            text = fake_clues(prompt)
+        self.send_json(200, {
+            "id": f"chatcmpl-mock{random.getrandbits(32):08x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4.1"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(text) // 4,
+                      "total_tokens": (len(prompt) + len(text)) // 4},
+        })
+
+    def send_json(self, status: int, payload: dict, headers: dict | None = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_event(self, event_type: str, payload: dict):
+        payload = {"type": event_type, **payload}
+        self.wfile.write(f"event: {event_type}\ndata: {json.dumps(payload)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+def start_mock_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0):
+    """Run the mock in a background thread. Returns (server, base_url)."""
+    handler = type("ConfiguredMockHandler", (MockHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+def add_config_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", default="fixed:300",
+                        help="fixed|uniform|exp|lognormal:<median ms> (default: fixed:300)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with a 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of persona replies with broken JSON (and of clue-pack hints that give the word away)")
+    parser.add_argument("--seed", type=int, default=None)
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(args.latency, args.error_rate, args.rate_limit_rate, args.malformed_rate, seed=args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline OpenAI mock for app.py and the IntelliSpell games.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(config_from_args(args), args.host, args.port)
+    print(f"Mock OpenAI listening. Use OPENAI_BASE_URL={base_url}  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import json
+import threading
+import time
+
+from json_stream import JsonFieldStream
+
+PERSONA_MODEL = "gpt-5"
+
+# Keys every persona card must have, in prompt order
+CARD_KEYS = [
+    "card_title", "name", "favorite", "persona_name", "tagline", "superpower",
+    "comfort_snack", "catchphrase", "why_it_matches", "predictions",
+]
+
+# How long finish_persona may spend repairing one card, and how many repair calls it may make
+REPAIR_BUDGET_SECONDS = 30
+MAX_REPAIRS = 2
+
+TONES = ["Sweet & Wholesome", "Funny & Playful", "Super Heroic", "Poetic & Warm"]
+DEFAULT_TONE = "Funny & Playful"
+
+def build_persona_prompt(name: str, favorite: str, tone: str, kid_safe: bool) -> str:
+    """The Inner Child Cartoon prompt, shared by app.py and the roster batch tool."""
+    style = tone
+    safety = "Very kid-safe, wholesome, no insults, no sensitive topics." if kid_safe else "Playful and funny, still respectful."
+
+    prompt = f"""
+You are a warm, funny, family-friendly storyteller.
+Create an "Inner Child Cartoon" persona for a participant.
+
+Participant:
+- Name: {name}
+- Childhood favorite: {favorite}
+- Style: {style}
+Safety: {safety}
+
+Rules:
+- This is purely playful, not real psychological analysis.
+- Keep it uplifting.
+- Make it feel like a cute cartoon character profile.
+
+Return ONLY valid JSON with these keys:
+{{
+  "card_title": "Inner Child Cartoon Card",
+  "name": "{name}",
+  "favorite": "{favorite}",
+  "persona_name": "",
+  "tagline": "",
+  "superpower": "",
+  "comfort_snack": "",
+  "catchphrase": "",
+  "why_it_matches": "",
+  "predictions": ["", "", ""]
+}}
+
+Predictions should be short, joyful, and relatable (not spooky).
+"""
+    return prompt
+
+def safe_json_parse(text: str):
+    """Best-effort JSON parser."""
+    text = text.strip()
+    # If the model adds extra text, try to extract JSON block
+    start = text.find("{")
+    end = text.rfind("}")
+    if start != -1 and end != -1 and end > start:
+        text = text[start:end+1]
+    return json.loads(text)
+
+# -----------------------------
+# Schema + repair
+# -----------------------------
+class PersonaFormatError(ValueError):
+    """The model output could not be turned into a valid card within the repair budget."""
+
+    def __init__(self, message: str, output_text: str):
+        super().__init__(message)
+        self.output_text = output_text
+
+class FormatStats:
+    """Process-wide counters for malformed output and the repairs that fixed it."""
+
+    def __init__(self):
+        self.parse_failures = 0   # output that was not valid JSON
+        self.invalid_cards = 0    # output that parsed or half-parsed but missed fields
+        self.repair_calls = 0     # follow-up requests for missing fields only
+        self.recovered = 0        # cards fixed by repair = "click again" round-trips saved
+        self.gave_up = 0
+        self._lock = threading.Lock()
+
+    def add(self, **counts) -> None:
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {k: v for k, v in vars(self).items() if not k.startswith("_")}
+
+format_stats = FormatStats()
+
+def card_schema(keys=CARD_KEYS) -> dict:
+    """Strict JSON schema for (a subset of) the card keys."""
+    props = {k: {"type": "string"} for k in keys if k != "predictions"}
+    if "predictions" in keys:
+        props["predictions"] = {"type": "array", "items": {"type": "string"}}
+    return {"type": "object", "properties": props, "required": list(keys), "additionalProperties": False}
+
+def text_format(keys=CARD_KEYS) -> dict:
+    """`text=` argument for client.responses.create that enforces card_schema."""
+    return {"format": {"type": "json_schema", "name": "persona_card", "schema": card_schema(keys), "strict": True}}
+
+PERSONA_TEXT_FORMAT = text_format()
+
+def invalid_fields(card: dict) -> list:
+    """Card keys that are missing, empty or the wrong type."""
+    bad = []
+    for k in CARD_KEYS:
+        v = card.get(k)
+        if k == "predictions":
+            ok = isinstance(v, list) and len(v) >= 3 and all(isinstance(p, str) and p.strip() for p in v[:3])
+        else:
+            ok = isinstance(v, str) and bool(v.strip())
+        if not ok:
+            bad.append(k)
+    return bad
+
+def is_valid_card_text(output_text: str) -> bool:
+    """True if the text parses to a card with every field present (no repair needed)."""
+    try:
+        card = safe_json_parse(output_text)
+    except ValueError:
+        return False
+    return isinstance(card, dict) and not invalid_fields(card)
+
+def salvage_fields(output_text: str) -> dict:
+    """Every top-level field that arrived complete, even if the JSON as a whole is broken."""
+    stream = JsonFieldStream()
+    return dict(stream.feed(output_text))
+
+def repair_prompt(prompt: str, partial: dict, missing: list) -> str:
+    return (
+        f"{prompt}\n"
+        f"These fields are already decided, keep them consistent:\n{json.dumps(partial, ensure_ascii=False)}\n\n"
+        f"Return ONLY valid JSON with exactly these keys: {', '.join(missing)}"
+    )
+
+def finish_persona(client, output_text: str, prompt: str, budget_s: float = REPAIR_BUDGET_SECONDS,
+                   run=None, on_usage=None) -> dict:
+    """
+    Turn model output into a valid card. If JSON is broken or fields are missing, ask the model
+    for just the missing fields (up to MAX_REPAIRS calls within budget_s) instead of starting over.
+    Repair calls go through `run(fn)` when given (e.g. AdmissionController.run), like the first request,
+    and `on_usage(usage)` gets each repair response's token usage.
+    Raises PersonaFormatError if the card still isn't valid.
+    """
+    try:
+        card = safe_json_parse(output_text)
+        if not isinstance(card, dict):
+            raise ValueError("not a JSON object")
+    except ValueError:
+        format_stats.add(parse_failures=1)
+        card = salvage_fields(output_text)
+
+    missing = invalid_fields(card)
+    if not missing:
+        return card
+
+    format_stats.add(invalid_cards=1)
+    deadline = time.monotonic() + budget_s
+    for _ in range(MAX_REPAIRS):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        partial = {k: v for k, v in card.items() if k in CARD_KEYS and k not in missing}
+        format_stats.add(repair_calls=1)
+
+        def repair_call():
+            remaining = deadline - time.monotonic()  # again: the wait for admission counts against the budget
+            if remaining <= 0:
+                raise TimeoutError("repair budget used up before the request was sent")
+            return client.responses.create(
+                model=PERSONA_MODEL,
+                input=repair_prompt(prompt, partial, missing),
+                text=text_format(missing),
+                timeout=remaining
+            )
+
+        try:
+            res = run(repair_call) if run else repair_call()
+            if on_usage is not None:
+                on_usage(getattr(res, "usage", None))
+            patch = safe_json_parse(res.output_text)
+        except Exception as ex:
+            print(f"[Persona] Repair request failed: {ex}")
+            continue
+        if isinstance(patch, dict):
+            card.update({k: v for k, v in patch.items() if k in missing})
+        missing = invalid_fields(card)
+        if not missing:
+            format_stats.add(recovered=1)
+            return card
+
+    format_stats.add(gave_up=1)
+    raise PersonaFormatError(f"Card still missing {', '.join(missing)}", output_text)
@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_key(name: str, favorite: str, tone: str, kid_safe: bool) -> str:
+    """Cache key for one persona request. Favorite is case-insensitive, name is kept as typed."""
+    name = " ".join(name.split())
+    favorite = " ".join(favorite.split()).lower()
+    return json.dumps([name, favorite, tone, bool(kid_safe)], ensure_ascii=False)
+
+
+class PersonaCache:
+    """
+    LRU cache for generated persona cards with a size limit and a TTL.
+    If `path` is given, entries are also kept in a JSON file so they survive restarts.
+    Safe to share between Streamlit sessions (one lock around everything).
+    """
+
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 24 * 3600, path: str | None = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()  # key -> (stored_at, card)
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def get(self, key: str):
+        """Return the cached card or None. Counts a hit or a miss."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and self._expired(item[0]):
+                del self._items[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def contains(self, key: str) -> bool:
+        """True if a fresh entry exists. Does not count as a hit or miss."""
+        with self._lock:
+            item = self._items.get(key)
+            return item is not None and not self._expired(item[0])
+
+    def put(self, key: str, card: dict) -> None:
+        with self._lock:
+            self._items[key] = (time.time(), card)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+            self._save()
+
+    def get_or_create(self, key: str, create, refresh: bool = False):
+        """
+        Return the cached card for `key`, or call `create()` and cache its result.
+        `refresh=True` skips the lookup and always stores a fresh card.
+        """
+        if not refresh:
+            card = self.get(key)
+            if card is not None:
+                return card
+        else:
+            with self._lock:
+                self.misses += 1
+        card = create()
+        self.put(key, card)
+        return card
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._save()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._items)}
+
+    # -----------------------------
+    # Internals
+    # -----------------------------
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - stored_at > self.ttl_seconds
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, stored_at, card in rows:
+            if not self._expired(stored_at):
+                self._items[key] = (stored_at, card)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        rows = [[key, stored_at, card] for key, (stored_at, card) in self._items.items()]
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(rows, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as ex:
+            print(f"[PersonaCache] Could not write {self.path}: {ex}")
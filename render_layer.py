@@ -0,0 +1,63 @@
+from functools import lru_cache
+
+import pygame
+
+
+@lru_cache(maxsize=512)
+def render_text(font, text: str, color) -> pygame.Surface:
+    """Antialiased text surface, rendered once per (font, text, color)."""
+    return font.render(text, True, color)
+
+
+class RenderLayer:
+    """
+    Retained text layer for the game screens. Each frame the game calls begin(), text() for
+    every string and present(). Only rectangles whose text changed since the last frame are
+    cleared, redrawn and pushed to the display; an unchanged frame costs no drawing at all.
+    """
+
+    def __init__(self, screen: pygame.Surface, background):
+        self.screen = screen
+        self.background = background
+        self._items = []   # (surface, rect) drawn this frame
+        self._shown = []   # what is on the display now
+        self._full = True  # first frame (or after invalidate()) redraws everything
+
+    def begin(self) -> None:
+        self._items = []
+
+    def text(self, font, text: str, color, pos) -> None:
+        surface = render_text(font, text, color)
+        self._items.append((surface, surface.get_rect(topleft=pos)))
+
+    def invalidate(self) -> None:
+        """Redraw the whole window on the next present() (e.g. after it was uncovered)."""
+        self._full = True
+
+    def present(self) -> None:
+        if self._full:
+            self.screen.fill(self.background)
+            for surface, rect in self._items:
+                self.screen.blit(surface, rect)
+            pygame.display.flip()
+            self._full = False
+        else:
+            dirty = self._dirty_rects()
+            for area in dirty:
+                self.screen.set_clip(area)
+                self.screen.fill(self.background)
+                for surface, rect in self._items:
+                    if rect.colliderect(area):
+                        self.screen.blit(surface, rect)
+            self.screen.set_clip(None)
+            if dirty:
+                pygame.display.update(dirty)
+        self._shown = self._items
+
+    def _dirty_rects(self) -> list:
+        # Cached surfaces are shared, so "same surface at the same place" means unchanged
+        before = {(id(s), tuple(r)) for s, r in self._shown}
+        after = {(id(s), tuple(r)) for s, r in self._items}
+        dirty = [r for s, r in self._shown if (id(s), tuple(r)) not in after]
+        dirty += [r for s, r in self._items if (id(s), tuple(r)) not in before]
+        return dirty
@@ -0,0 +1,188 @@
+"""
+Bulk roster mode: generate Inner Child cards for a whole class before the event.
+
+    python roster_batch.py roster.csv --out class_cards --concurrency 8
+
+The roster CSV needs `name` and `favorite` columns and may have a `tone` column
+(one of the app's styles; blank means the app default).
+
+Persona calls run on a thread pool (at most --concurrency in flight) and cards are
+rendered in a process pool. Progress is checkpointed in <out>/personas.jsonl and
+<out>/png/, so re-running the same command after a crash only does the missing rows.
+The result is <out>/cards.zip (PNGs + manifest.json) and <out>/manifest.json.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from dotenv import load_dotenv
+from openai import OpenAI
+
+from card_image import make_card_image
+from persona import (
+    DEFAULT_TONE, PERSONA_MODEL, PERSONA_TEXT_FORMAT, TONES, build_persona_prompt, finish_persona, format_stats
+)
+from persona_cache import make_key
+
+# -----------------------------
+# Roster + checkpoint files
+# -----------------------------
+def read_roster(path: str) -> list:
+    """Rows of {name, favorite, tone}. Rows without a name or favorite are skipped."""
+    rows = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for rec in csv.DictReader(f):
+            rec = {(k or "").strip().lower(): (v or "").strip() for k, v in rec.items()}
+            name, favorite = rec.get("name", ""), rec.get("favorite", "")
+            if not (name and favorite):
+                print(f"[roster] Skipping incomplete row: {rec}")
+                continue
+            tone = rec.get("tone") or DEFAULT_TONE
+            if tone not in TONES:
+                print(f"[roster] Unknown tone '{tone}' for {name}, using '{DEFAULT_TONE}'")
+                tone = DEFAULT_TONE
+            rows.append({"name": name, "favorite": favorite, "tone": tone})
+    return rows
+
+def load_checkpoint(path: str) -> dict:
+    """key -> card for every persona already generated by a previous run."""
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # half-written last line from a crash
+            done[rec["key"]] = rec["card"]
+    return done
+
+def card_filename(index: int, name: str, key: str) -> str:
+    """The persona key's hash is in the name, so an edited row (new favorite or tone) never reuses an old PNG."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "card"
+    return f"{index:03d}_{slug}_{hashlib.sha256(key.encode('utf-8')).hexdigest()[:8]}.png"
+
+def write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# -----------------------------
+# Pipeline
+# -----------------------------
+def generate_persona(client, row: dict, kid_safe: bool) -> dict:
+    prompt = build_persona_prompt(row["name"], row["favorite"], row["tone"], kid_safe)
+    res = client.responses.create(model=PERSONA_MODEL, input=prompt, text=PERSONA_TEXT_FORMAT)
+    return finish_persona(client, res.output_text, prompt)
+
+def run_batch(rows: list, out_dir: str, client, concurrency: int = 8, workers: int | None = None,
+              kid_safe: bool = True) -> list:
+    """Generate and render every row, skipping work a previous run finished. Returns the manifest entries."""
+    png_dir = os.path.join(out_dir, "png")
+    os.makedirs(png_dir, exist_ok=True)
+    checkpoint_path = os.path.join(out_dir, "personas.jsonl")
+    cards = load_checkpoint(checkpoint_path)
+
+    entries = []
+    for i, row in enumerate(rows, start=1):
+        key = make_key(row["name"], row["favorite"], row["tone"], kid_safe)
+        entries.append({**row, "key": key, "file": card_filename(i, row["name"], key), "status": "pending"})
+
+    todo_llm = [e for e in entries if e["key"] not in cards]
+    todo_render = [e for e in entries if e["key"] in cards and not os.path.exists(os.path.join(png_dir, e["file"]))]
+    print(f"[roster] {len(entries)} rows: {len(entries) - len(todo_llm)} personas already done, "
+          f"{len(todo_llm)} to generate, {len(todo_render)} cards to render")
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as llm_pool, \
+            ProcessPoolExecutor(max_workers=workers) as render_pool, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        renders = {render_pool.submit(make_card_image, cards[e["key"]]): e for e in todo_render}
+
+        llm_jobs = {llm_pool.submit(generate_persona, client, e, kid_safe): e for e in todo_llm}
+        for n, fut in enumerate(as_completed(llm_jobs), start=1):
+            entry = llm_jobs[fut]
+            try:
+                card = fut.result()
+            except Exception as ex:
+                entry["status"] = "failed"
+                entry["error"] = str(ex)
+                print(f"[roster] {n}/{len(llm_jobs)} persona failed for {entry['name']}: {ex}")
+                continue
+            cards[entry["key"]] = card
+            checkpoint.write(json.dumps({"key": entry["key"], "card": card}, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+            print(f"[roster] {n}/{len(llm_jobs)} persona ready for {entry['name']}")
+            renders[render_pool.submit(make_card_image, card)] = entry
+
+        for fut in as_completed(renders):
+            entry = renders[fut]
+            try:
+                write_atomic(os.path.join(png_dir, entry["file"]), fut.result())
+            except Exception as ex:
+                entry["status"] = "failed"
+                entry["error"] = f"render: {ex}"
+                print(f"[roster] Render failed for {entry['name']}: {ex}")
+
+    for entry in entries:
+        if entry["status"] == "pending" and os.path.exists(os.path.join(png_dir, entry["file"])):
+            entry["status"] = "ok"
+            entry["persona_name"] = cards[entry["key"]].get("persona_name", "")
+    return entries
+
+def write_outputs(entries: list, out_dir: str) -> str:
+    """Write manifest.json and cards.zip (every finished PNG plus the manifest). Returns the zip path."""
+    manifest = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "model": PERSONA_MODEL,
+        "cards": [{k: v for k, v in e.items() if k != "key"} for e in entries],
+    }
+    manifest_json = json.dumps(manifest, indent=2, ensure_ascii=False)
+    write_atomic(os.path.join(out_dir, "manifest.json"), manifest_json.encode("utf-8"))
+
+    zip_path = os.path.join(out_dir, "cards.zip")
+    tmp_path = f"{zip_path}.tmp"
+    with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as zf:  # PNGs are already compressed
+        for e in entries:
+            if e["status"] == "ok":
+                zf.write(os.path.join(out_dir, "png", e["file"]), e["file"])
+        zf.writestr("manifest.json", manifest_json)
+    os.replace(tmp_path, zip_path)
+    return zip_path
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate Inner Child cards for a whole roster CSV.")
+    parser.add_argument("roster", help="CSV with name, favorite and optional tone columns")
+    parser.add_argument("--out", default="roster_cards", help="output/checkpoint folder (default: roster_cards)")
+    parser.add_argument("--concurrency", type=int, default=8, help="max persona requests in flight (default: 8)")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--no-kid-safe", dest="kid_safe", action="store_false", help="turn off extra kid-safe mode")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found. Put it in a .env file.")
+    client = OpenAI(api_key=api_key)
+
+    rows = read_roster(args.roster)
+    entries = run_batch(rows, args.out, client, args.concurrency, args.workers, args.kid_safe)
+    zip_path = write_outputs(entries, args.out)
+
+    failed = [e for e in entries if e["status"] != "ok"]
+    print(f"[roster] Output format: {format_stats.snapshot()}")
+    print(f"[roster] Wrote {zip_path}: {len(entries) - len(failed)} cards, {len(failed)} failed")
+    if failed:
+        print("[roster] Run the same command again to retry the failed rows.")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Session recorder, deterministic replay and solve-time export for the IntelliSpell games.
+
+    python session_log.py replay session_logs/intelliword-20261017-101500-4242.splog
+    python session_log.py replay LOG --trace --speed 4      # print every event, 4x real time
+    python session_log.py stats session_logs/*.splog --out solve_times.csv
+
+The games record every key press, dealt word with its clues, late AI clues, phase change and
+clue shown, each with its game time in ms. Each deck is shuffled with its own RNG, seeded from
+one seeded from the log, so replay rebuilds the same decks (however far ahead the game read them)
+and runs the same spell_engine transitions headless, checking that every recorded word, phase
+and clue comes out the same.
+
+Format: a header (magic, version, JSON meta with the seed and rules) followed by uint32 words:
+two per event, (time ms, kind << 24 | size), then `size` bytes of UTF-8 text padded to 4 bytes.
+Events are appended to an array in memory and written out on each phase change and dealt word,
+so a key press costs two appends and an unchanged frame costs two comparisons.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import statistics
+import struct
+import sys
+import time
+from array import array
+from dataclasses import asdict
+
+from spell_engine import (
+    BACKSPACE, ENTER, GAME_OVER, NAME, PLAY, SHOW_ANSWER, SHOW_CORRECT,
+    Rules, clues_arrived, deal, new_game, press, tick,
+)
+
+MAGIC, VERSION = b"SPLG", 1
+HEADER = struct.Struct("<4sHI")  # magic, version, meta length
+DEFAULT_DIR = os.getenv("SESSION_LOG_DIR", "session_logs")
+PHASES = (NAME, PLAY, SHOW_CORRECT, SHOW_ANSWER, GAME_OVER)
+SEP = "\x1f"  # between the word and clues in one text event
+
+# Event kinds. KEY carries the character's code point in place of a size.
+KEY, KEY_ENTER, KEY_BACKSPACE, DEAL, DEAL_FALLBACK, CLUES, PHASE, CLUE_SHOWN = range(1, 9)
+KIND_NAMES = {KEY: "key", KEY_ENTER: "enter", KEY_BACKSPACE: "backspace", DEAL: "deal", DEAL_FALLBACK: "deal",
+              CLUES: "clues", PHASE: "phase", CLUE_SHOWN: "clue"}
+TEXT_KINDS = (DEAL, DEAL_FALLBACK, CLUES, CLUE_SHOWN)
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+class Recorder:
+    """
+    Append-only session log. Recorder.open() with enabled=False (or no directory) gives a
+    recorder that writes nothing but still owns the seeded deck RNG, so the game code is the same.
+    """
+
+    def __init__(self, path, rules: Rules, seed: int = None, **meta):
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)  # pass to build_deck / refill_deck
+        self.path = path
+        self._buf = array("I")
+        self._phase = self._clue = None
+        self._f = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            meta = dict(meta, seed=self.seed, rules=asdict(rules), started=time.time())
+            blob = json.dumps(meta).encode("utf-8")
+            self._f = open(path, "wb")
+            self._f.write(HEADER.pack(MAGIC, VERSION, len(blob)) + blob)
+            self._f.flush()
+
+    @classmethod
+    def open(cls, game: str, rules: Rules, enabled: bool = True, directory: str = DEFAULT_DIR, **meta):
+        """A recorder writing to <directory>/<game>-<date>-<time>-<pid>.splog."""
+        name = os.path.splitext(os.path.basename(game))[0]
+        path = None
+        if enabled and directory:
+            path = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.splog")
+        return cls(path, rules, game=os.path.basename(game), **meta)
+
+    def _event(self, now: int, kind: int, arg: int = 0) -> None:
+        if self._f:
+            self._buf.append(now & 0xFFFFFFFF)
+            self._buf.append(kind << 24 | arg)
+
+    def _text(self, now: int, kind: int, text: str) -> None:
+        if self._f:
+            data = text.encode("utf-8")[:0xFFFFFF]
+            self._event(now, kind, len(data))
+            self._buf.frombytes(data + b"\0" * (-len(data) % 4))
+
+    def key(self, key: str, now: int) -> None:
+        """Record a key exactly as passed to spell_engine.press (keys press() ignores are skipped)."""
+        if key == ENTER:
+            self._event(now, KEY_ENTER)
+        elif key == BACKSPACE:
+            self._event(now, KEY_BACKSPACE)
+        elif len(key) == 1:
+            self._event(now, KEY, ord(key))
+
+    def deal(self, word: str, clues, is_fallback: bool, now: int) -> None:
+        self._text(now, DEAL_FALLBACK if is_fallback else DEAL, SEP.join([word, *clues]))
+        self.flush()  # the game can stay in PLAY for a whole streak; keep each finished word on disk
+
+    def clues(self, clues, now: int) -> None:
+        self._text(now, CLUES, SEP.join(clues))
+
+    def observe(self, state, now: int) -> None:
+        """Call once per frame after the state has settled: records phase changes and new clues."""
+        if state.phase != self._phase:
+            self._phase = state.phase
+            self._event(now, PHASE, PHASES.index(state.phase))
+            self.flush()
+        if state.clue_text != self._clue:
+            self._clue = state.clue_text
+            if state.phase == PLAY and state.clue_text:
+                self._text(now, CLUE_SHOWN, state.clue_text)
+
+    def flush(self) -> None:
+        if self._f and self._buf:
+            buf = self._buf
+            if sys.byteorder == "big":
+                buf = array("I", buf)
+                buf.byteswap()
+            self._f.write(buf.tobytes())
+            self._f.flush()
+            del self._buf[:]
+
+    def close(self) -> None:
+        if self._f:
+            self.flush()
+            self._f.close()
+            self._f = None
+
+
+# -----------------------------
+# Reading and replay
+# -----------------------------
+def read_log(path: str) -> tuple:
+    """(meta, [(time ms, kind, arg or text)]). A torn last event (e.g. after a crash) is dropped."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, meta_len = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} session log")
+    meta = json.loads(data[HEADER.size:HEADER.size + meta_len])
+    body = data[HEADER.size + meta_len:]
+    words = array("I")
+    words.frombytes(body[:len(body) - len(body) % 4])
+    if sys.byteorder == "big":
+        words.byteswap()
+
+    events, i = [], 0
+    while i + 1 < len(words):
+        t, kind, arg = words[i], words[i + 1] >> 24, words[i + 1] & 0xFFFFFF
+        i += 2
+        if kind in TEXT_KINDS:
+            n = (arg + 3) // 4
+            if i + n > len(words):
+                break
+            arg = words[i:i + n].tobytes()[:arg].decode("utf-8", "replace")
+            i += n
+        events.append((t, kind, arg))
+    return meta, events
+
+
+def replay(path: str, words=None, on_event=None, speed: float = 0) -> tuple:
+    """
+    Run a log back through spell_engine. Returns (final state, mismatches). `words` is the game's
+    base word list; with it the deck is rebuilt from the seed and each dealt word is checked too.
+    on_event(t, kind, arg, before, after) is called for every event. speed=0 replays as fast as
+    possible, otherwise at `speed` times real time.
+    """
+    from word_deck import build_deck, refill_deck
+
+    meta, events = read_log(path)
+    rng = random.Random(meta["seed"])
+    state = new_game(Rules(**meta["rules"]))
+    deck = build_deck(words, meta.get("difficulty"), rng) if words else None
+    mismatches = []
+    started, first = time.perf_counter(), events[0][0] if events else 0
+
+    for t, kind, arg in events:
+        if speed:
+            delay = (t - first) / 1000 / speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        before = state
+        if kind in (KEY, KEY_ENTER, KEY_BACKSPACE):
+            key = chr(arg) if kind == KEY else ENTER if kind == KEY_ENTER else BACKSPACE
+            state = press(state, key, t)
+            if deck is not None and before.phase == GAME_OVER and state.phase == NAME:
+                deck = build_deck(words, meta.get("difficulty"), rng)
+        elif kind in (DEAL, DEAL_FALLBACK):
+            word, *clues = arg.split(SEP)
+            state = tick(state, t)
+            if deck is not None:
+                if not deck:
+                    deck = refill_deck(words, meta.get("auto_generate", True), meta.get("generated_count", 60), rng,
+                                       meta.get("difficulty"))
+                expected = deck.pop()
+                if expected != word:
+                    mismatches.append(f"{t} ms: dealt {word!r}, seeded deck gives {expected!r}")
+            state = deal(state, word, clues, kind == DEAL_FALLBACK)
+        elif kind == CLUES:
+            state = clues_arrived(state, arg.split(SEP))
+        elif kind == PHASE:
+            state = tick(state, t)
+            if state.phase != PHASES[arg]:
+                mismatches.append(f"{t} ms: recorded phase {PHASES[arg]}, replay is in {state.phase}")
+        elif kind == CLUE_SHOWN and state.clue_text != arg:
+            mismatches.append(f"{t} ms: recorded clue {arg!r}, replay shows {state.clue_text!r}")
+        if on_event:
+            on_event(t, kind, arg, before, state)
+    return state, mismatches
+
+
+def log_words(meta: dict) -> list:
+    """The base WORDS of the game that wrote the log, if its script is in the current directory."""
+    from clue_cache import game_words
+
+    return game_words([meta["game"]]) if meta.get("game") else []
+
+
+# -----------------------------
+# Solve-time statistics
+# -----------------------------
+def word_attempts(path: str) -> list:
+    """One dict per dealt word: word, outcome (solved / failed / unfinished), solve_ms, wrong, keys."""
+    attempts = []
+
+    def on_event(t, kind, arg, before, after):
+        if kind in (DEAL, DEAL_FALLBACK):
+            attempts.append({"word": after.current_word, "outcome": "unfinished", "solve_ms": None, "wrong": 0,
+                             "keys": 0, "dealt_at": t, "ai_clues": kind == DEAL})
+            return
+        if not attempts or attempts[-1]["outcome"] != "unfinished" or before.phase != PLAY:
+            return
+        current = attempts[-1]
+        if kind in (KEY, KEY_ENTER, KEY_BACKSPACE):
+            current["keys"] += 1
+        if kind == CLUES:
+            current["ai_clues"] = True
+        if kind != KEY_ENTER:
+            return
+        if after.score > before.score:
+            current["outcome"], current["solve_ms"] = "solved", t - current["dealt_at"]
+        elif after.lives < before.lives or after.failed_words > before.failed_words:
+            current["wrong"] += 1
+            if after.failed_words > before.failed_words:
+                current["outcome"] = "failed"
+
+    replay(path, on_event=on_event)
+    return attempts
+
+
+def solve_stats(paths) -> list:
+    """Per-word rows over all logs: attempts, solved, failed, median/mean solve seconds, wrong guesses."""
+    by_word = {}
+    for path in paths:
+        for a in word_attempts(path):
+            by_word.setdefault(a["word"], []).append(a)
+    rows = []
+    for word, attempts in sorted(by_word.items()):
+        times = [a["solve_ms"] / 1000 for a in attempts if a["outcome"] == "solved"]
+        rows.append({
+            "word": word, "letters": len(word), "attempts": len(attempts), "solved": len(times),
+            "failed": sum(a["outcome"] == "failed" for a in attempts),
+            "median_solve_s": round(statistics.median(times), 2) if times else "",
+            "mean_solve_s": round(statistics.fmean(times), 2) if times else "",
+            "mean_wrong_guesses": round(statistics.fmean(a["wrong"] for a in attempts), 2),
+            "mean_keys": round(statistics.fmean(a["keys"] for a in attempts), 1),
+        })
+    return rows
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Replay IntelliSpell session logs and export solve times.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("replay", help="run a log back through the game rules, headless")
+    rep.add_argument("log")
+    rep.add_argument("--speed", type=float, default=0, help="times real time (default: as fast as possible)")
+    rep.add_argument("--trace", action="store_true", help="print every event")
+    rep.add_argument("--no-deck-check", dest="deck_check", action="store_false",
+                     help="don't rebuild the deck from the seed (e.g. the game's WORDS have changed)")
+    stats = sub.add_parser("stats", help="per-word solve-time statistics as CSV")
+    stats.add_argument("logs", nargs="+")
+    stats.add_argument("--out", default=None, help="CSV file (default: print to the terminal)")
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        meta, events = read_log(args.log)
+
+        def trace(t, kind, arg, before, after):
+            shown = chr(arg) if kind == KEY else PHASES[arg] if kind == PHASE else arg if kind in TEXT_KINDS else ""
+            print(f"{t / 1000:9.3f}s  {KIND_NAMES[kind]:<9} {str(shown).replace(SEP, ' | ')}")
+
+        words = log_words(meta) if args.deck_check else None
+        t = time.perf_counter()
+        state, mismatches = replay(args.log, words, trace if args.trace else None, args.speed)
+        took = time.perf_counter() - t
+        played = (events[-1][0] - events[0][0]) / 1000 if events else 0
+        print(f"[Replay] {len(events)} events, {played:.0f}s of play, replayed in {took * 1000:.1f} ms "
+              f"({played / took if took else 0:,.0f}x real time); deck check {'on' if words else 'off'}")
+        print(f"[Replay] Final: {state.phase}, player {state.player_name!r}, score {state.score}, "
+              f"failed {state.failed_words}")
+        for m in mismatches:
+            print(f"[Replay] Mismatch at {m}")
+        if mismatches:
+            sys.exit(1)
+    else:
+        rows = solve_stats(args.logs)
+        out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]) if rows else ["word"])
+        writer.writeheader()
+        writer.writerows(rows)
+        if args.out:
+            out.close()
+            print(f"[Stats] {len(rows)} words from {len(args.logs)} log(s) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
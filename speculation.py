@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+from persona import PERSONA_MODEL, PERSONA_TEXT_FORMAT
+
+
+def fetch_persona_text(client, prompt: str, cancelled: threading.Event, model: str = PERSONA_MODEL,
+                       on_usage=None):
+    """
+    Background persona request. Streams so it can stop early:
+    once `cancelled` is set the stream is closed (or never opened) and None is returned.
+    `on_usage(usage)` gets the token usage of a response that completed.
+    """
+    if cancelled.is_set():
+        return None
+    events = client.responses.create(
+        model=model,
+        input=prompt,
+        text=PERSONA_TEXT_FORMAT,
+        stream=True
+    )
+    chunks = []
+    try:
+        for event in events:
+            if cancelled.is_set():
+                return None
+            if event.type == "response.output_text.delta":
+                chunks.append(event.delta)
+            elif event.type == "response.completed" and on_usage is not None:
+                on_usage(getattr(event.response, "usage", None))
+    finally:
+        events.close()
+    return "".join(chunks)
+
+
+class Speculation:
+    """A persona request started before the user clicked, for one cache key."""
+
+    def __init__(self, key: str, future, cancelled: threading.Event, usage: list):
+        self.key = key
+        self.future = future
+        self.usage = usage  # usage of each response that completed, appended by the worker
+        self.started_at = time.perf_counter()
+        self._cancelled = cancelled
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        self.future.cancel()
+
+    def result(self):
+        """Wait for the output text. Returns None if the request failed or was cancelled."""
+        try:
+            return self.future.result()
+        except (Exception, CancelledError) as ex:
+            print(f"[Speculation] Prefetch failed, falling back to a normal request: {ex}")
+            return None
+
+
+def start_speculation(pool, client, key: str, prompt: str, admission=None) -> Speculation:
+    """Submit the background request; if `admission` is given it waits its turn like a click would."""
+    cancelled = threading.Event()
+    usage = []
+    if admission is None:
+        future = pool.submit(fetch_persona_text, client, prompt, cancelled, on_usage=usage.append)
+    else:
+        def admitted_fetch():
+            if cancelled.is_set():  # went stale while waiting for a worker; don't queue for admission
+                return None
+            return admission.run(lambda: fetch_persona_text(client, prompt, cancelled, on_usage=usage.append))
+
+        future = pool.submit(admitted_fetch)
+    return Speculation(key, future, cancelled, usage)
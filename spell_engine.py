@@ -0,0 +1,137 @@
+"""
+Headless IntelliSpell game engine: the NAME / PLAY / SHOW_CORRECT / SHOW_ANSWER / GAME_OVER
+state machine without pygame, globals or I/O.
+
+GameState is immutable. Each transition takes a state, an input and the clock (ms) and
+returns a new state:
+
+    state = new_game(Rules(lives_per_word=3, max_failed_words=5))
+    state = press(state, "a", now)          # or ENTER / BACKSPACE
+    state = tick(state, now)                # timers (SHOW_ANSWER, SHOW_CORRECT)
+    if needs_word(state):
+        state = deal(state, word, clues, is_fallback)
+    state = clues_arrived(state, clues)     # AI clues that came in after the word started
+
+Where words and clues come from (deck, prefetcher, clue pack) is up to the frontend.
+"""
+from dataclasses import dataclass, replace
+
+NAME, PLAY, SHOW_CORRECT, SHOW_ANSWER, GAME_OVER = "NAME", "PLAY", "SHOW_CORRECT", "SHOW_ANSWER", "GAME_OVER"
+ENTER, BACKSPACE = "enter", "backspace"  # special keys; any other key is the typed character
+NO_CLUE = "No clue available"
+
+
+@dataclass(frozen=True, slots=True)
+class Rules:
+    lives_per_word: int = 3
+    max_failed_words: int = 5
+    points_per_word: int = 10
+    show_answer_ms: int = 2000
+    show_correct_ms: int | None = None  # None: go straight to the next word after a correct guess
+    max_name_length: int = 18
+
+
+@dataclass(frozen=True, slots=True)
+class GameState:
+    rules: Rules
+    phase: str = NAME
+    player_name: str = ""
+    typed: str = ""
+    current_word: str = ""  # "" while PLAY is waiting for deal()
+    clues: tuple = ()
+    clues_are_fallback: bool = False  # True until the AI clues for current_word arrive
+    clue_index: int = 0
+    clue_text: str = ""
+    lives: int = 0
+    failed_words: int = 0
+    score: int = 0
+    revealed_count: int = 0
+    timer_until: int = 0  # ms deadline for SHOW_ANSWER / SHOW_CORRECT
+    correct_word: str = ""
+
+
+def new_game(rules: Rules) -> GameState:
+    return GameState(rules, lives=rules.lives_per_word)
+
+
+def needs_word(state: GameState) -> bool:
+    return state.phase == PLAY and not state.current_word
+
+
+def has_timer(state: GameState) -> bool:
+    return state.phase in (SHOW_ANSWER, SHOW_CORRECT)
+
+
+def deal(state: GameState, word: str, clues, is_fallback: bool = False) -> GameState:
+    """Start `word` with its clues (possibly fallback clues until the AI ones arrive)."""
+    clues = tuple(clues)
+    return replace(
+        state, current_word=word, clues=clues, clues_are_fallback=is_fallback, lives=state.rules.lives_per_word,
+        typed="", clue_index=0, revealed_count=0, clue_text=clues[0] if clues else NO_CLUE,
+    )
+
+
+def clues_arrived(state: GameState, clues) -> GameState:
+    if state.phase != PLAY or not state.clues_are_fallback:
+        return state
+    clues = tuple(clues)
+    clue_text = clues[state.clue_index] if state.clue_index < len(clues) else state.clue_text
+    return replace(state, clues=clues, clues_are_fallback=False, clue_text=clue_text)
+
+
+def press(state: GameState, key: str, now: int) -> GameState:
+    """One key press: ENTER, BACKSPACE or the typed character."""
+    if state.phase == NAME:
+        if key == BACKSPACE:
+            return replace(state, player_name=state.player_name[:-1])
+        if key == ENTER:
+            return replace(state, phase=PLAY, current_word="") if state.player_name.strip() else state
+        if len(key) == 1 and key.isprintable() and len(state.player_name) < state.rules.max_name_length:
+            return replace(state, player_name=state.player_name + key)
+        return state
+
+    if state.phase == PLAY:
+        if key == BACKSPACE:
+            return replace(state, typed=state.typed[:-1])
+        if key == ENTER:
+            return _guess(state, now)
+        if len(key) == 1 and key.isalpha():
+            return replace(state, typed=state.typed + key.lower())
+        return state
+
+    if state.phase == GAME_OVER and key == ENTER:
+        return new_game(state.rules)
+    return state
+
+
+def tick(state: GameState, now: int) -> GameState:
+    """Advance timers: end SHOW_ANSWER / SHOW_CORRECT once their deadline has passed."""
+    if not has_timer(state) or now <= state.timer_until:
+        return state
+    if state.phase == SHOW_ANSWER and state.failed_words >= state.rules.max_failed_words:
+        return replace(state, phase=GAME_OVER)
+    return replace(state, phase=PLAY, current_word="")
+
+
+def _guess(state: GameState, now: int) -> GameState:
+    rules = state.rules
+    if state.typed.lower().strip() == state.current_word:
+        score = state.score + rules.points_per_word
+        if rules.show_correct_ms is None:
+            return replace(state, score=score, current_word="")
+        return replace(state, score=score, correct_word=state.current_word, phase=SHOW_CORRECT,
+                       timer_until=now + rules.show_correct_ms)
+
+    clue_index = state.clue_index + 1
+    state = replace(
+        state, lives=state.lives - 1, revealed_count=state.revealed_count + 1, clue_index=clue_index, typed="",
+        clue_text=state.clues[clue_index] if clue_index < len(state.clues) else state.clue_text,
+    )
+    if state.lives == 0:
+        return replace(state, failed_words=state.failed_words + 1, phase=SHOW_ANSWER,
+                       timer_until=now + rules.show_answer_ms)
+    return state
+
+
+def mask_word(word, revealed_count=0):
+    return " ".join(ch if i < revealed_count else "_" for i, ch in enumerate(word))
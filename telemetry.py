@@ -0,0 +1,94 @@
+import json
+import math
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+class RequestTimer:
+    """Per-request stage timings (high-resolution, in ms), token usage and tags."""
+
+    def __init__(self, **tags):
+        self.request_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.stages = {}
+        self.tokens = {}
+        self.tags = tags
+        self._lock = threading.Lock()  # a hedged request's two tiers can report usage at once
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter_ns() - t0) / 1e6
+
+    def record_usage(self, usage) -> None:
+        """Add token counts from a Responses API `usage` object (or dict). Missing usage is ignored."""
+        if usage is None:
+            return
+        if not isinstance(usage, dict):
+            usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+        details = usage.get("output_tokens_details") or {}
+        counts = {
+            "input": usage.get("input_tokens"),
+            "output": usage.get("output_tokens"),
+            "reasoning": details.get("reasoning_tokens"),
+            "total": usage.get("total_tokens"),
+        }
+        with self._lock:
+            for k, v in counts.items():
+                if v is not None:
+                    self.tokens[k] = self.tokens.get(k, 0) + v
+
+    def record(self) -> dict:
+        return {
+            "ts": round(self.started_at, 3),
+            "request_id": self.request_id,
+            **self.tags,
+            "stages_ms": {k: round(v, 3) for k, v in self.stages.items()},
+            "total_ms": round((time.time() - self.started_at) * 1000, 3),
+            "tokens": self.tokens,
+        }
+
+
+class Telemetry:
+    """
+    Collects finished RequestTimers: appends one JSON line per request to `path` (if set)
+    and keeps the last `window` timings per stage for rolling percentiles.
+    """
+
+    def __init__(self, path: str | None = None, window: int = 500):
+        self.path = path
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def emit(self, timer: RequestTimer) -> dict:
+        rec = timer.record()
+        with self._lock:
+            for name, ms in rec["stages_ms"].items():
+                self._samples[name].append(ms)
+            self._samples["total"].append(rec["total_ms"])
+            if self.path:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                except OSError as ex:
+                    print(f"[Telemetry] Could not write {self.path}: {ex}")
+        return rec
+
+    def percentiles(self, pcts=(50, 95, 99)) -> list:
+        """Rows of {stage, n, p50, p95, p99} (ms) over the rolling window."""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+        rows = []
+        for name, values in samples.items():
+            row = {"stage": name, "n": len(values)}
+            for p in pcts:
+                row[f"p{p}"] = round(values[max(0, math.ceil(p / 100 * len(values)) - 1)], 1)
+            rows.append(row)
+        return rows
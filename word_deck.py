@@ -0,0 +1,35 @@
+import random
+
+
+def build_deck(words, difficulty=None, rng=random):
+    """
+    Shuffle words into a 'deck' so no repeats within a game; with a difficulty, draw from the word index instead.
+    The deck gets its own generator seeded from `rng`, so `rng` advances by exactly one draw per deck
+    however far ahead the deck is read.
+    """
+    deck_rng = random.Random(rng.getrandbits(64))
+    if difficulty:
+        from word_index import default_index
+        try:
+            return default_index().deck(difficulty, rng=deck_rng)
+        except (OSError, ValueError) as e:
+            print(f"[Deck] Word index unavailable ({e}); using the base words")
+    deck = list(words)
+    deck_rng.shuffle(deck)
+    return deck
+
+def refill_deck(words, auto_generate=True, count=60, rng=random, difficulty=None):
+    """
+    Next deck once one runs out: a fresh deck from the word index for a difficulty, otherwise
+    `count` new real words from the n-gram generator, or the base words again.
+    """
+    if difficulty or not auto_generate:
+        return build_deck(words, difficulty, rng)
+
+    from word_gen import default_generator  # trained on first use, not at game start
+    deck_rng = random.Random(rng.getrandbits(64))
+    deck = default_generator().real_words(count, exclude=words, rng=deck_rng)
+    if not deck:
+        return build_deck(words, rng=deck_rng)
+    deck_rng.shuffle(deck)
+    return deck
@@ -0,0 +1,104 @@
+"""
+Character n-gram word generator for refilling the game decks.
+
+An order-3 Markov model over letters is trained on a real word list (word_list.txt beside this
+module, or WORD_LIST_FILE). Candidates are sampled in batches and only the ones that are in
+the lexicon are kept, so refill_deck gets real words the clue step can describe instead of
+random consonant/vowel strings.
+
+    gen = WordGenerator.from_file("word_list.txt")
+    gen.generate(5000)                       # raw candidates, mostly word-like, some real
+    gen.real_words(60, exclude=WORDS)        # 60 unique lexicon words, none from WORDS
+
+The transition tables are flat arrays: for each context, a run of (next letter, cumulative
+count) pairs found with one bisect per letter.
+"""
+import bisect
+import os
+import random
+from array import array
+from functools import lru_cache
+
+DEFAULT_WORD_LIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "word_list.txt")
+ORDER = 3
+START, END = "^", "$"
+MIN_LENGTH, MAX_LENGTH = 4, 12
+CANDIDATES_PER_WORD = 10  # ~30% of candidates are lexicon words, fewer once duplicates pile up
+
+
+def load_word_list(path: str) -> list:
+    """Lowercase alphabetic words from a one-word-per-line file (anything after the word is ignored)."""
+    words = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if parts and parts[0].isalpha() and parts[0].isascii():
+                words.append(parts[0].lower())
+    return words
+
+
+class WordGenerator:
+    def __init__(self, words, order: int = ORDER, lexicon=None):
+        self.order = order
+        self.lexicon = frozenset(lexicon if lexicon is not None else words)
+
+        counts = {}  # context -> {next letter: count}
+        for w in set(words):
+            padded = START * order + w + END
+            for i in range(len(w) + 1):
+                nxt = counts.setdefault(padded[i:i + order], {})
+                nxt[padded[i + order]] = nxt.get(padded[i + order], 0) + 1
+
+        # Context i owns next_char[offsets[i]:offsets[i + 1]] and the matching cumulative counts.
+        self.contexts = {}
+        self.offsets = array("I", [0])
+        self.next_char = []
+        self.cum = array("I")
+        for ctx, nxt in counts.items():
+            self.contexts[ctx] = len(self.contexts)
+            total = 0
+            for ch, n in sorted(nxt.items()):
+                total += n
+                self.next_char.append(ch)
+                self.cum.append(total)
+            self.offsets.append(len(self.cum))
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_WORD_LIST, order: int = ORDER):
+        return cls(load_word_list(path), order)
+
+    def generate(self, n: int, rng=random) -> list:
+        """Sample n candidates (duplicates and non-words included) of MIN_LENGTH..MAX_LENGTH letters."""
+        contexts, offsets, next_char, cum = self.contexts, self.offsets, self.next_char, self.cum
+        order, rand, find = self.order, rng.random, bisect.bisect_right
+        out = []
+        for _ in range(n):
+            ctx, w = START * order, ""
+            while len(w) <= MAX_LENGTH:
+                i = contexts[ctx]
+                lo, hi = offsets[i], offsets[i + 1]
+                ch = next_char[find(cum, rand() * cum[hi - 1], lo, hi - 1)]
+                if ch == END:
+                    break
+                w += ch
+                ctx = ctx[1:] + ch
+            if MIN_LENGTH <= len(w) <= MAX_LENGTH:
+                out.append(w)
+        return out
+
+    def real_words(self, count: int, exclude=(), rng=random, max_rounds: int = 20) -> list:
+        """Up to `count` unique lexicon words not in `exclude`, in the order they were generated."""
+        exclude = set(exclude)
+        found = {}
+        for _ in range(max_rounds):
+            for w in self.generate(CANDIDATES_PER_WORD * (count - len(found)), rng):
+                if w in self.lexicon and w not in exclude:
+                    found[w] = None
+                    if len(found) == count:
+                        return list(found)
+        return list(found)
+
+
+@lru_cache(maxsize=None)
+def default_generator() -> WordGenerator:
+    return WordGenerator.from_file(os.getenv("WORD_LIST_FILE", DEFAULT_WORD_LIST))
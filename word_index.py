@@ -0,0 +1,223 @@
+"""
+Indexed word list for large dictionaries, with difficulty bands for the game decks.
+
+    python word_index.py build words.tsv --out word_index.bin   # "word count" per line, 100k+ words is fine
+    python word_index.py build word_list.txt                    # no counts: every word counts as common
+    python word_index.py stats word_index.bin
+    python word_index.py deck word_index.bin --difficulty easy --count 20
+
+The index file is a small header and bucket table followed by the words themselves. Words are
+grouped into buckets by (length, frequency band, first letter), and every word in a bucket has
+the same length, so the n-th word of a bucket is found with one multiply and nothing else is
+stored per word. The file is memory-mapped: opening it reads only the bucket table, and pages
+of words are loaded the first time a deck touches them.
+
+A deck for a difficulty is a lazy, no-repeat shuffle over the buckets it allows. Each word is
+drawn in constant time no matter how many words the selection holds.
+"""
+import argparse
+import bisect
+import mmap
+import os
+import random
+import struct
+import time
+from array import array
+from functools import lru_cache
+
+MAGIC, VERSION = b"SPWX", 1
+HEADER = struct.Struct("<4sHHHHI")  # magic, version, max length, bands, letters, words
+DEFAULT_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "word_index.bin")
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+MIN_LENGTH, MAX_LENGTH = 3, 15
+BAND_RANKS = (2000, 10000, 30000, 60000)  # frequency rank where each band ends; band 4 is everything rarer
+
+# difficulty -> (shortest, longest) word length and (most, least) common frequency band, inclusive
+DIFFICULTIES = {
+    "easy": ((3, 5), (0, 1)),
+    "medium": ((5, 8), (0, 2)),
+    "hard": ((7, MAX_LENGTH), (0, len(BAND_RANKS))),
+}
+
+
+def _bucket(length: int, band: int, letter: int) -> int:
+    return ((length * (len(BAND_RANKS) + 1)) + band) * len(LETTERS) + letter
+
+
+N_BUCKETS = _bucket(MAX_LENGTH + 1, 0, 0)
+
+
+# -----------------------------
+# Build
+# -----------------------------
+def read_counts(path: str) -> dict:
+    """{word: count} from "word [count]" lines. Words without a count get 0."""
+    counts = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            word = parts[0].lower()
+            if not (word.isascii() and word.isalpha() and MIN_LENGTH <= len(word) <= MAX_LENGTH):
+                continue
+            count = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+            counts[word] = max(count, counts.get(word, 0))
+    return counts
+
+
+def build_index(counts: dict, out: str) -> int:
+    """Write the index for {word: count}; returns the number of words."""
+    has_counts = any(counts.values())
+    ranked = sorted(counts, key=lambda w: (-counts[w], w))
+    buckets = [[] for _ in range(N_BUCKETS)]
+    for rank, word in enumerate(ranked):
+        band = bisect.bisect_right(BAND_RANKS, rank) if has_counts else 0
+        buckets[_bucket(len(word), band, ord(word[0]) - ord("a"))].append(word)
+
+    starts, byte_starts = array("I", [0]), array("I", [0])
+    for b, words in enumerate(buckets):
+        starts.append(starts[-1] + len(words))
+        byte_starts.append(byte_starts[-1] + sum(map(len, words)))
+
+    tmp = out + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, MAX_LENGTH, len(BAND_RANKS) + 1, len(LETTERS), len(counts)))
+        f.write(starts.tobytes())
+        f.write(byte_starts.tobytes())
+        for words in buckets:
+            f.write("".join(words).encode("ascii"))
+    os.replace(tmp, out)
+    return len(counts)
+
+
+# -----------------------------
+# Read
+# -----------------------------
+class WordIndex:
+    """Read-only, memory-mapped view of an index file written by build_index."""
+
+    def __init__(self, path: str = DEFAULT_INDEX):
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_length, bands, letters, n_words = HEADER.unpack_from(self._data)
+        if (magic, version, max_length, bands, letters) != (MAGIC, VERSION, MAX_LENGTH, len(BAND_RANKS) + 1, len(LETTERS)):
+            raise ValueError(f"{path} is not a version {VERSION} word index; rebuild it with `python word_index.py build`")
+        table = (N_BUCKETS + 1) * 4
+        self.starts = array("I", self._data[HEADER.size:HEADER.size + table])
+        self.byte_starts = array("I", self._data[HEADER.size + table:HEADER.size + 2 * table])
+        self._words_at = HEADER.size + 2 * table
+        self.n_words = n_words
+
+    def __len__(self) -> int:
+        return self.n_words
+
+    def bucket_size(self, b: int) -> int:
+        return self.starts[b + 1] - self.starts[b]
+
+    def word(self, b: int, i: int) -> str:
+        """The i-th word of bucket b."""
+        length = (self.byte_starts[b + 1] - self.byte_starts[b]) // self.bucket_size(b)
+        at = self._words_at + self.byte_starts[b] + i * length
+        return self._data[at:at + length].decode("ascii")
+
+    def buckets(self, difficulty: str = None, letters: str = LETTERS) -> list:
+        """Non-empty buckets for a difficulty (None: every word), optionally only some first letters."""
+        (shortest, longest), (common, rare) = DIFFICULTIES[difficulty] if difficulty else (
+            (MIN_LENGTH, MAX_LENGTH), (0, len(BAND_RANKS)))
+        return [b for length in range(shortest, longest + 1) for band in range(common, rare + 1)
+                for letter in letters.lower() if letter in LETTERS
+                for b in [_bucket(length, band, LETTERS.index(letter))] if self.bucket_size(b)]
+
+    def deck(self, difficulty: str = None, letters: str = LETTERS, rng=random, size: int = None):
+        return Deck(self, self.buckets(difficulty, letters), rng, size)
+
+
+class Deck:
+    """
+    No-repeat random deck over some buckets of a WordIndex, used like the list decks:
+    len(), pop() and deck[-n:] (the next n words, the next one last). Words are drawn with a
+    lazy Fisher-Yates shuffle, so each pop is O(1) and memory grows only with the words drawn.
+    """
+
+    def __init__(self, index: WordIndex, buckets: list, rng=random, size: int = None):
+        self.index = index
+        self.buckets = buckets
+        self.offsets = array("I", [0])  # virtual position where each bucket starts
+        for b in buckets:
+            self.offsets.append(self.offsets[-1] + index.bucket_size(b))
+        self.rng = rng
+        self._left = self.offsets[-1] if size is None else min(size, self.offsets[-1])
+        self._unshuffled = self.offsets[-1]
+        self._swaps = {}
+        self._ahead = []  # drawn but not popped yet; the next word is last
+
+    def __len__(self) -> int:
+        return self._left + len(self._ahead)
+
+    def _draw(self) -> str:
+        n = self._unshuffled
+        j = self.rng.randrange(n)
+        pos = self._swaps.get(j, j)
+        self._swaps[j] = self._swaps.pop(n - 1, n - 1)
+        self._unshuffled, self._left = n - 1, self._left - 1
+        k = bisect.bisect_right(self.offsets, pos) - 1
+        return self.index.word(self.buckets[k], pos - self.offsets[k])
+
+    def pop(self) -> str:
+        if self._ahead:
+            return self._ahead.pop()
+        if not self._left:
+            raise IndexError("pop from empty deck")
+        return self._draw()
+
+    def __getitem__(self, key):
+        """Only the top of the deck can be read: deck[-n] or deck[-n:]."""
+        start = key.start if isinstance(key, slice) else key
+        if start is None or start >= 0 or (isinstance(key, slice) and (key.stop is not None or key.step is not None)):
+            raise IndexError("a word index deck can only be read from the top, e.g. deck[-4:]")
+        while len(self._ahead) < -start and self._left:
+            self._ahead.insert(0, self._draw())
+        return self._ahead[key]
+
+
+@lru_cache(maxsize=None)
+def default_index() -> WordIndex:
+    return WordIndex(os.getenv("WORD_INDEX_FILE", DEFAULT_INDEX))
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect the indexed word list.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index a word list of 'word [count]' lines")
+    build.add_argument("words")
+    build.add_argument("--out", default=DEFAULT_INDEX)
+    stats = sub.add_parser("stats", help="words per difficulty")
+    stats.add_argument("index", nargs="?", default=DEFAULT_INDEX)
+    deck = sub.add_parser("deck", help="draw a sample deck")
+    deck.add_argument("index", nargs="?", default=DEFAULT_INDEX)
+    deck.add_argument("--difficulty", choices=sorted(DIFFICULTIES), default=None)
+    deck.add_argument("--letters", default=LETTERS, help="only words starting with these letters")
+    deck.add_argument("--count", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        t = time.perf_counter()
+        n = build_index(read_counts(args.words), args.out)
+        print(f"[WordIndex] {n} words -> {args.out} ({os.path.getsize(args.out) / 1024:.0f} KB) "
+              f"in {time.perf_counter() - t:.1f}s")
+    elif args.command == "stats":
+        index = WordIndex(args.index)
+        print(f"{args.index}: {len(index)} words")
+        for name in DIFFICULTIES:
+            print(f"  {name:<7} {sum(index.bucket_size(b) for b in index.buckets(name)):>8} words")
+    else:
+        d = WordIndex(args.index).deck(args.difficulty, args.letters, size=args.count)
+        print(" ".join(d.pop() for _ in range(len(d))))
+
+
+if __name__ == "__main__":
+    main()